@@ -0,0 +1,106 @@
+"""Throughput of verse-reference parsing on chat traffic: trie scanner vs. the old regex.
+
+Run from the repository root:
+
+    python benchmarks/bench_parse.py [--messages N] [--repeat R]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bible  # noqa: E402
+
+# The regex-based parser that bible.parse_verse_reference replaced, kept here for comparison
+_LEGACY_VERSE_PATTERN = re.compile(
+    r"(?<!\w)"
+    r"((?:[123]\s*)?[A-Za-z]+)"
+    r"\s+"
+    r"(\d+)"
+    r"(?:\s*:\s*(\d+)"
+    r"(?:\s*[-–]\s*(\d+))?"
+    r")?"
+    r"(?!\w)",
+    re.IGNORECASE,
+)
+
+
+def legacy_parse_verse_reference(text):
+    m = _LEGACY_VERSE_PATTERN.search(text)
+    if not m:
+        return None
+    raw_book = m.group(1).strip().lower()
+    raw_book = re.sub(r"^([123])\s+", r"\1 ", raw_book)
+    book_id = bible.BOOK_ALIASES.get(raw_book)
+    if book_id is None:
+        return None
+    chapter = int(m.group(2))
+    verse_start = int(m.group(3)) if m.group(3) else None
+    verse_end = int(m.group(4)) if m.group(4) else None
+    if verse_end is not None and verse_start is not None and verse_end < verse_start:
+        return None
+    return book_id, chapter, verse_start, verse_end
+
+
+# Typical server chat: mostly no references, many "word number" pairs, a few real references
+_CHAT_TEMPLATES = [
+    "good morning everyone",
+    "anyone going to mass tonight?",
+    "meet at 5 in room 12",
+    "the rosary starts at 7 pm, bring 2 friends",
+    "lol that was great",
+    "I read chapter 4 yesterday, page 120 onwards",
+    "praying for you all today 🙏",
+    "Adoration is on Thursday from 6 to 8",
+    "my flight lands at gate 23 around 10",
+    "does anyone have the link for the livestream",
+    "we need 3 more volunteers for Saturday",
+    "happy feast day!",
+    "John 3:16",
+    "today's gospel was Luke 15:11-32",
+    "see 1 Cor 13:4-7 for that",
+    "Ps 23 is my favourite",
+]
+
+
+def build_corpus(size, seed=0):
+    rnd = random.Random(seed)
+    return [rnd.choice(_CHAT_TEMPLATES) for _ in range(size)]
+
+
+def measure(func, corpus, repeat):
+    """Return the best messages-per-second over `repeat` passes of `corpus`."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for message in corpus:
+            func(message)
+        best = min(best, time.perf_counter() - start)
+    return len(corpus) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages)
+    mismatches = [m for m in set(corpus)
+                  if legacy_parse_verse_reference(m) != bible.parse_verse_reference(m)]
+    if mismatches:
+        print(f"note: parsers disagree on {len(mismatches)} distinct messages: {mismatches}")
+
+    legacy = measure(legacy_parse_verse_reference, corpus, args.repeat)
+    scanner = measure(bible.parse_verse_reference, corpus, args.repeat)
+    print(f"legacy regex : {legacy:12,.0f} msg/s")
+    print(f"trie scanner : {scanner:12,.0f} msg/s  ({scanner / legacy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
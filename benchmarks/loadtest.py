@@ -0,0 +1,376 @@
+"""End-to-end load test of the bot's handlers against local stand-in upstreams.
+
+Run from the repository root (next to saint_quotes.db):
+
+    python benchmarks/loadtest.py [--rate 50] [--count 2000] [--mix message=90,command=5,search=5]
+                                  [--upstream-latency 0.2] [--error-rate 0.05] [--timeout-rate 0.01]
+                                  [--daily 200] [--output results.json]
+
+Nothing talks to Discord or the real upstreams.  benchmarks/stand_ins.py
+serves recorded Missale Meum, saint calendar and USCCB responses with the
+configured latency and failures, and the bot's fetchers are pointed at it.
+Fake messages and interactions are fed to ``on_message`` and
+``search_command`` at a steady arrival rate (open loop, so a slow handler
+doesn't slow the arrivals).  Fake channels answer ``send()`` after
+--discord-latency, behind the bot's real send queue and cooldowns.  With
+--daily, the daily pipeline also runs once for that many subscribed channels.
+
+The report gives latency percentiles per request kind (for /search, also the
+time to acknowledge the interaction), the calls each upstream received, and
+the bot's cache, queue and worker pool counters.  The stand-in serves USCCB
+readings as stored JSON rather than the scraped HTML page, so
+``readings.fetch_mass`` is swapped for a client of that route.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_parse import build_corpus  # noqa: E402
+from stand_ins import UPSTREAMS, Behaviour, StandIns  # noqa: E402
+
+COMMANDS = ("!readings", "!latin", "!saint", "!quote")
+SEARCHES = ("lord", "shepherd", '"the lord"', "grace peace", "spirit", "heaven earth", "pasture", "king of glory")
+PERCENTILES = (50, 90, 99)
+
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.mention = f"<@{user_id}>"
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMessage:
+    def __init__(self, content="", author=None, channel=None):
+        self.id = random.getrandbits(63)
+        self.content = content
+        self.author = author
+        self.channel = channel
+        self.guild = None
+
+    async def edit(self, **kwargs):
+        return self
+
+
+class FakeChannel:
+    """Accepts ``send()`` after a fixed delay, like a Discord API call."""
+
+    def __init__(self, channel_id, latency):
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.latency = latency
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.sent += 1
+        return FakeMessage(args[0] if args else "", channel=self)
+
+
+class FakeCallbackResponse:
+    def __init__(self, message):
+        self.resource = message
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send_message(self, *args, **kwargs):
+        await self._interaction.answer()
+        return FakeCallbackResponse(FakeMessage())
+
+    async def defer(self, **kwargs):
+        await self._interaction.answer()
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self._interaction = interaction
+
+    async def send(self, *args, wait=False, **kwargs):
+        await asyncio.sleep(self._interaction.latency)
+        return FakeMessage()
+
+
+class FakeInteraction:
+    def __init__(self, user, latency):
+        self.user = user
+        self.guild_id = None
+        self.latency = latency
+        self.acked_at = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def answer(self):
+        await asyncio.sleep(self.latency)
+        self.acked_at = time.perf_counter()
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of sorted `values`."""
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+def summarize(samples):
+    values = sorted(samples)
+    if not values:
+        return {"count": 0}
+    summary = {"count": len(values)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = percentile(values, p) * 1000
+    summary["max_ms"] = values[-1] * 1000
+    return summary
+
+
+def parse_mix(spec):
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, weight = item.partition("=")
+        if kind not in ("message", "command", "search"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind {kind!r}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def _prepare_environment(args):
+    """Point every store at a scratch directory; the bot module reads these at import."""
+    scratch = tempfile.mkdtemp(prefix="lucebot-loadtest-")
+    os.environ.setdefault("DISCORD_TOKEN", "loadtest")
+    os.environ["LITURGY_DB_PATH"] = os.path.join(scratch, "liturgy.db")
+    os.environ["SUBSCRIPTIONS_DB_PATH"] = os.path.join(scratch, "subscriptions.db")
+    os.environ["QUOTE_ROTATION_PATH"] = os.path.join(scratch, "quote_rotation.json")
+    os.environ["COMMAND_SYNC_PATH"] = os.path.join(scratch, "command_sync.json")
+    os.environ["READINGS_SOURCE"] = args.readings_source
+    return scratch
+
+
+def _point_at_stand_ins(base_url, client_timeout):
+    import aiohttp
+
+    import http_client
+    import latin_readings
+    import readings
+    import saints
+
+    http_client.TIMEOUT = aiohttp.ClientTimeout(total=client_timeout, connect=min(5, client_timeout))
+    latin_readings.API_URL = f"{base_url}/missalemeum/en/api/v5/proper"
+    saints.API_BASE = f"{base_url}/saints"
+
+    async def fetch_mass(date):
+        try:
+            status, data = await http_client.get_json(f"{base_url}/usccb/bible/readings/{date:%m%d%y}.json")
+        except Exception:
+            logging.getLogger("lucebot").exception("Failed to fetch stand-in USCCB readings")
+            return None
+        return readings.mass_from_dict(data) if status == 200 else None
+
+    readings.fetch_mass = fetch_mass
+
+
+class Driver:
+    def __init__(self, bot, args):
+        self.bot = bot
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.corpus = build_corpus(args.count, seed=args.seed)
+        self.channels = {i: FakeChannel(i, args.discord_latency) for i in range(1, args.channels + 1)}
+        self.latencies = {}
+        self.acks = []
+        self.errors = {}
+
+    def _record(self, kind, seconds):
+        self.latencies.setdefault(kind, []).append(seconds)
+
+    def _user(self):
+        return FakeUser(self.random.randint(1, self.args.users))
+
+    def _channel(self):
+        return self.channels[self.random.randint(1, self.args.channels)]
+
+    async def _timed(self, kind, coro):
+        start = time.perf_counter()
+        try:
+            await coro
+        except Exception:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            logging.getLogger("lucebot").exception("%s handler failed", kind)
+            return start
+        self._record(kind, time.perf_counter() - start)
+        return start
+
+    async def message(self, content):
+        kind = "message.reference" if self.bot.parse_all_references(content) else "message.chat"
+        await self._timed(kind, self.bot.on_message(FakeMessage(content, self._user(), self._channel())))
+
+    async def command(self, content):
+        await self._timed(content, self.bot.on_message(FakeMessage(content, self._user(), self._channel())))
+
+    async def search(self, query):
+        interaction = FakeInteraction(self._user(), self.args.discord_latency)
+        start = await self._timed("/search", self.bot.search_command.callback(interaction, query))
+        if interaction.acked_at is not None:
+            self.acks.append(interaction.acked_at - start)
+
+    def _next_request(self, i):
+        kinds, weights = zip(*self.args.mix.items())
+        kind = self.random.choices(kinds, weights)[0]
+        if kind == "command":
+            return self.command(self.random.choice(COMMANDS))
+        if kind == "search":
+            return self.search(self.random.choice(SEARCHES))
+        return self.message(self.corpus[i % len(self.corpus)])
+
+    async def traffic(self):
+        """Start requests at `rate` per second regardless of how long earlier ones take."""
+        start = time.perf_counter()
+        tasks = []
+        for i in range(self.args.count):
+            delay = start + i / self.args.rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self._next_request(i)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    async def daily(self):
+        """Run the daily pipeline once for --daily subscribed channels."""
+        from subscriptions import Subscription
+
+        channels = {}
+        due = []
+        today = datetime.date.today()
+        for i in range(self.args.daily):
+            channel = FakeChannel(10_000_000 + i, self.args.discord_latency)
+            channels[channel.id] = channel
+            readings_type = "latin" if i % 4 == 0 else "novus_ordo"
+            due.append((Subscription(channel.id, None, readings_type, ("readings", "quote", "saint")), today))
+        self.bot.client.get_channel = channels.get
+        await self._timed("daily", self.bot.post_daily(due))
+        return sum(channel.sent for channel in channels.values())
+
+
+async def run(args):
+    scratch = _prepare_environment(args)
+    import bot
+
+    if not args.verbose:
+        logging.getLogger("lucebot").setLevel(logging.WARNING)
+        logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
+    behaviour = dict(latency=args.upstream_latency, jitter=args.upstream_jitter, error_rate=args.error_rate,
+                     timeout_rate=args.timeout_rate, hang=args.hang)
+    stand_ins = await StandIns({name: Behaviour(**behaviour) for name in UPSTREAMS}, seed=args.seed).start()
+    _point_at_stand_ins(stand_ins.base_url, args.client_timeout)
+    bot.outbox.start()
+    bot.search_pool.start()
+
+    driver = Driver(bot, args)
+    try:
+        jobs = [driver.traffic()]
+        if args.daily:
+            jobs.append(driver.daily())
+        results = await asyncio.gather(*jobs)
+    finally:
+        bot.search_pool.shutdown()
+        await bot.outbox.stop()
+        import http_client
+
+        await http_client.close()
+        await stand_ins.stop()
+
+    import latin_readings
+    import readings
+    import saints
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "scratch_dir": scratch,
+        "elapsed_s": results[0],
+        "achieved_rate": args.count / results[0],
+        "latency": {kind: summarize(samples) for kind, samples in sorted(driver.latencies.items())},
+        "search_ack": summarize(driver.acks),
+        "errors": driver.errors,
+        "upstream_calls": stand_ins.stats(),
+        "caches": {
+            name: cache.stats()
+            for name, cache in (("readings", readings._readings_cache), ("latin", latin_readings._latin_cache),
+                                ("saint", saints._saint_cache))
+        },
+        "send_queue": bot.outbox.stats(),
+        "search_pool": bot.search_pool.stats(),
+        "cooldowns": bot.COOLDOWNS.stats(),
+        "channel_sends": sum(channel.sent for channel in driver.channels.values()),
+    }
+    if args.daily:
+        report["daily_sends"] = results[1]
+    return report
+
+
+def print_report(report):
+    print(f"{report['config']['count']} requests in {report['elapsed_s']:.1f}s "
+          f"({report['achieved_rate']:.1f}/s)")
+    print(f"{'kind':20} {'count':>7} " + " ".join(f"{'p' + str(p):>9}" for p in PERCENTILES) + f" {'max':>9}")
+    rows = dict(report["latency"])
+    rows["/search ack"] = report["search_ack"]
+    for kind, s in rows.items():
+        if not s["count"]:
+            continue
+        print(f"{kind:20} {s['count']:>7} "
+              + " ".join(f"{s[f'p{p}_ms']:>7.1f}ms" for p in PERCENTILES) + f" {s['max_ms']:>7.1f}ms")
+    if report["errors"]:
+        print(f"handler errors: {report['errors']}")
+    for name, stats in report["upstream_calls"].items():
+        print(f"upstream {name:12} {stats['calls']:>5} calls, {stats['errors']} errors, {stats['timeouts']} timeouts")
+    for name, stats in report["caches"].items():
+        print(f"cache {name:15} {stats}")
+    print(f"send queue: {report['send_queue']}")
+    print(f"search pool: {report['search_pool']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=50, help="requests started per second")
+    parser.add_argument("--count", type=int, default=2000, help="requests in total")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("message=90,command=5,search=5"),
+                        help="relative weights of message, command and search requests")
+    parser.add_argument("--channels", type=int, default=100)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--daily", type=int, default=0, help="also run the daily pipeline for this many channels")
+    parser.add_argument("--readings-source", default="usccb", choices=("auto", "local", "usccb"))
+    parser.add_argument("--upstream-latency", type=float, default=0.2, help="seconds")
+    parser.add_argument("--upstream-jitter", type=float, default=0.1, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of upstream calls answered with 503")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="share of upstream calls that hang")
+    parser.add_argument("--hang", type=float, default=30.0, help="seconds a hanging upstream call stalls")
+    parser.add_argument("--client-timeout", type=float, default=15.0, help="the bot's HTTP timeout, in seconds")
+    parser.add_argument("--discord-latency", type=float, default=0.05, help="seconds per fake Discord API call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the report as JSON here")
+    parser.add_argument("--verbose", action="store_true", help="keep the bot's INFO logging")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Benchmark suite for the Bible, parsing and formatting hot paths.
+
+Run from the repository root:
+
+    python benchmarks/run.py [--output results.json] [--baseline baseline.json] [--only NAME] [--quick]
+
+Results are printed (or written to --output) as JSON: one metric per name,
+with its unit and whether lower or higher is better.  With --baseline, each
+metric is compared against an earlier run; any that got worse by more than
+--threshold (default 10%) is reported and the exit status is 1, so a CI step
+can fail on regressions.  Timings are the best of several repeats, which is
+the most stable figure on a shared machine.
+
+The readings fixtures in benchmarks/fixtures are stored entries in the
+liturgy store's format (placeholder text at real sizes); record real ones
+from a filled store with ``--record-fixtures KIND:DATE``.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(ROOT, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_parse import build_corpus  # noqa: E402
+
+# Runs in a fresh interpreter so the load is cold and its memory is the Bible's alone
+_LOAD_SCRIPT = """
+import json, os, resource, sys, time
+sys.path.insert(0, {root!r})
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(line.split()[1]) for line in f if line.startswith("VmRSS:"))
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+import bible_store
+before = rss_kb()
+start = time.perf_counter()
+store = {load}
+elapsed = time.perf_counter() - start
+store.verses("Gen", 1)
+print(json.dumps({{"seconds": elapsed, "rss_kb": rss_kb() - before}}))
+"""
+
+
+def metric(value, unit, better="lower"):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def best_time(func, number, repeat):
+    """Best seconds per call of `func` over `repeat` runs of `number` calls, with GC off as in timeit."""
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def bench_bible_load(args):
+    source = os.path.join(ROOT, "knox.json")
+    compiled = os.path.join(ROOT, "knox.bin")
+    loads = {"ndjson": f"bible_store.DictBible.from_ndjson({source!r})"}
+    if os.path.exists(compiled):
+        loads["compiled"] = f"bible_store.load_bible({source!r}, {compiled!r})"
+    # The whole module, as the bot imports it: discord.py, the Bible, aliases and autocomplete tables
+    loads["import"] = "__import__('bible').BIBLE"
+    results = {}
+    for name, load in loads.items():
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run([sys.executable, "-c", _LOAD_SCRIPT.format(root=ROOT, load=load)],
+                                 capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(out))
+        results[f"bible_load.{name}.time"] = metric(min(r["seconds"] for r in runs) * 1000, "ms")
+        results[f"bible_load.{name}.rss"] = metric(min(r["rss_kb"] for r in runs) / 1024, "MB")
+    return results
+
+
+def bench_parse(args):
+    import bible
+
+    corpus = build_corpus(args.messages)
+    results = {}
+    for name, func in (("parse_verse_reference", bible.parse_verse_reference),
+                       ("parse_all_references", bible.parse_all_references)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for message in corpus:
+                func(message)
+            best = min(best, time.perf_counter() - start)
+        results[f"{name}.throughput"] = metric(len(corpus) / best, "msg/s", "higher")
+    return results
+
+
+def _sample_passages(bible):
+    """A single verse and the longest chapter, picked from whatever Bible is loaded."""
+    book_id = next(iter(bible.BIBLE.book_ids()))
+    chapter = bible.BIBLE.chapter_numbers(book_id)[0]
+    verse = bible.BIBLE.verses(book_id, chapter)[0][0]
+    longest = max(((b, c) for b in bible.BIBLE.book_ids() for c in bible.BIBLE.chapter_numbers(b)),
+                  key=lambda bc: len(bible.BIBLE.verses(*bc)))
+    return {"verse": (book_id, chapter, verse, verse), "chapter": (*longest, None, None)}
+
+
+def bench_lookup(args):
+    import bible
+
+    results = {}
+    for name, ref in _sample_passages(bible).items():
+        verses = bible.lookup_verses(*ref)
+        lookup = best_time(lambda: bible.lookup_verses(*ref), args.number, args.repeat)
+        view = best_time(lambda: bible.format_bible_view(*ref, verses), max(1, args.number // 10), args.repeat)
+        results[f"lookup_verses.{name}"] = metric(lookup * 1e6, "us")
+        results[f"format_bible_view.{name}"] = metric(view * 1e6, "us")
+    return results
+
+
+def bench_search(args):
+    import bible
+
+    start = time.perf_counter()
+    bible.warm_search_index()
+    results = {"search_index.build": metric((time.perf_counter() - start) * 1000, "ms")}
+    for name, query in (("hit", "lord"), ("phrase", '"the lord"'), ("miss", "xyzzyplugh")):
+        seconds = best_time(lambda: bible.search_verses(query), max(1, args.number // 100), args.repeat)
+        results[f"search_verses.{name}"] = metric(seconds * 1e6, "us")
+    return results
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, f"{name}.json")) as f:
+        return json.load(f)
+
+
+def bench_format(args):
+    from latin_readings import format_latin_for_discord
+    from readings import format_for_discord, mass_from_dict
+
+    results = {}
+    for name in sorted(os.listdir(FIXTURES)):
+        name, _ = os.path.splitext(name)
+        data = _fixture(name)
+        if name.startswith("novus_ordo"):
+            mass = mass_from_dict(data)
+            seconds = best_time(lambda: format_for_discord(mass), args.number // 10, args.repeat)
+            results[f"format_for_discord.{name}"] = metric(seconds * 1e6, "us")
+        elif name.startswith("latin"):
+            seconds = best_time(lambda: format_latin_for_discord(data), args.number // 10, args.repeat)
+            results[f"format_latin_for_discord.{name}"] = metric(seconds * 1e6, "us")
+    return results
+
+
+BENCHMARKS = {
+    "bible_load": bench_bible_load,
+    "parse": bench_parse,
+    "lookup": bench_lookup,
+    "search": bench_search,
+    "format": bench_format,
+}
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """Print each metric against the baseline; return the names that regressed beyond `threshold`."""
+    regressions = []
+    print(f"{'metric':48} {'baseline':>14} {'current':>14} {'change':>8}", file=sys.stderr)
+    for name, current in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            print(f"{name:48} {'-':>14} {current['value']:>14.2f} {'new':>8}", file=sys.stderr)
+            continue
+        change = current["value"] / base["value"] - 1
+        worse = change > threshold if current["better"] == "lower" else change < -threshold
+        if worse:
+            regressions.append(name)
+        print(f"{name:48} {base['value']:>14.2f} {current['value']:>14.2f} {change:>+7.1%}"
+              f"{'  REGRESSION' if worse else ''}", file=sys.stderr)
+    return regressions
+
+
+def record_fixture(spec):
+    """Copy a stored entry (``novus_ordo:2026-03-29`` or ``latin:2026-03-29``) into the fixtures."""
+    import liturgy_store
+
+    kind, _, date = spec.partition(":")
+    data = liturgy_store.load(kind, datetime.date.fromisoformat(date))
+    if data is None:
+        raise SystemExit(f"No {kind} entry for {date} in {liturgy_store.STORE_PATH}")
+    path = os.path.join(FIXTURES, f"{kind}_{date}.json")
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    print(f"Recorded {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write the results JSON here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts as a regression")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for a smoke test")
+    parser.add_argument("--repeat", type=int, help="timing repeats (best is kept); default 5, or 2 with --quick")
+    parser.add_argument("--messages", type=int, default=20000, help="chat messages in the parsing corpus")
+    parser.add_argument("--record-fixtures", metavar="KIND:DATE", action="append",
+                        help="copy an entry from the liturgy store into benchmarks/fixtures and exit")
+    args = parser.parse_args()
+
+    if args.record_fixtures:
+        for spec in args.record_fixtures:
+            record_fixture(spec)
+        return
+    args.repeat = args.repeat or (2 if args.quick else 5)
+    args.number = 100 if args.quick else 1000
+    if args.quick:
+        args.messages = min(args.messages, 2000)
+
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if not args.only or name in args.only:
+            results.update(bench(args))
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Local stand-ins for the bot's upstream HTTP services, for offline load tests.
+
+One aiohttp server answers for all three upstreams under its own path prefix,
+serving the recorded responses in benchmarks/fixtures for any date:
+
+    /missalemeum/en/api/v5/proper/<date>      latin_readings.API_URL
+    /saints/<year>/<mm-dd>.json               saints.API_BASE
+    /usccb/bible/readings/<MMDDYY>.json       Novus Ordo readings, in the liturgy store's format
+
+Each upstream has its own latency (plus uniform jitter), error rate (HTTP
+503) and timeout rate (the response hangs for `hang` seconds), and counts
+the calls it gets.  Run it alone to point a hand-patched bot at it:
+
+    python benchmarks/stand_ins.py [--port 8080] [--latency 0.2] [--error-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from aiohttp import web
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+UPSTREAMS = {
+    "missalemeum": "latin_sunday.json",
+    "saints": "saint_memorial.json",
+    "usccb": "novus_ordo_ordinary_sunday.json",
+}
+
+
+class Behaviour:
+    """How one upstream answers, and how often it has been called.
+
+    Each call waits `latency` plus up to `jitter` seconds; then `error_rate` of
+    calls get a 503 and `timeout_rate` of them stall for `hang` seconds.
+    """
+
+    def __init__(self, latency=0.1, jitter=0.05, error_rate=0.0, timeout_rate=0.0, hang=30.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+
+    def stats(self):
+        return {"calls": self.calls, "errors": self.errors, "timeouts": self.timeouts}
+
+
+class StandIns:
+    """The stand-in server; ``base_url`` is set once it has started."""
+
+    def __init__(self, behaviours=None, *, host="127.0.0.1", port=0, seed=0):
+        self.behaviours = {name: Behaviour() for name in UPSTREAMS}
+        self.behaviours.update(behaviours or {})
+        self.host = host
+        self.port = port
+        self.base_url = None
+        self._random = random.Random(seed)
+        self._bodies = {}
+        for name, fixture in UPSTREAMS.items():
+            with open(os.path.join(FIXTURES, fixture), "rb") as f:
+                self._bodies[name] = f.read()
+        self._runner = None
+
+    def _handler(self, name):
+        behaviour = self.behaviours[name]
+
+        async def handle(request):
+            behaviour.calls += 1
+            roll = self._random.random()
+            await asyncio.sleep(behaviour.latency + self._random.uniform(0, behaviour.jitter))
+            if roll < behaviour.timeout_rate:
+                behaviour.timeouts += 1
+                await asyncio.sleep(behaviour.hang)
+            elif roll < behaviour.timeout_rate + behaviour.error_rate:
+                behaviour.errors += 1
+                return web.Response(status=503, text="stand-in error")
+            return web.Response(body=self._bodies[name], content_type="application/json")
+
+        return handle
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/missalemeum/en/api/v5/proper/{date}", self._handler("missalemeum"))
+        app.router.add_get("/saints/{year}/{day}.json", self._handler("saints"))
+        app.router.add_get("/usccb/bible/readings/{code}.json", self._handler("usccb"))
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{self.host}:{port}"
+        return self
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self):
+        return {name: behaviour.stats() for name, behaviour in self.behaviours.items()}
+
+
+async def _serve(args):
+    behaviour = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                     timeout_rate=args.timeout_rate, hang=args.hang)
+    stand_ins = await StandIns({name: Behaviour(**behaviour) for name in UPSTREAMS}, port=args.port).start()
+    print(f"Serving stand-in upstreams at {stand_ins.base_url}")
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(json.dumps(stand_ins.stats()))
+    finally:
+        await stand_ins.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang", type=float, default=30.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,21 @@
-import json
+import heapq
+import math
 import os
 import re
+import threading
+from array import array
+from bisect import bisect_left
 
 import discord
-from discord.ui import LayoutView, Container, TextDisplay
+from discord.ui import ActionRow, Button, LayoutView, Container, Separator, TextDisplay
+
+from bible_store import load_bible
+from cache import MISSING, LRUCache, TTLCache
 
 # Path to the Knox Bible NDJSON file (one JSON object per line)
 BIBLE_PATH = os.path.join(os.path.dirname(__file__), "knox.json")
+# Precompiled binary form of the same data (see bible_store.py); used when present and current
+BIBLE_COMPILED_PATH = os.path.join(os.path.dirname(__file__), "knox.bin")
 
 # Mapping from common user input names to the book_id used in knox.json.
 # Includes abbreviations, full names, and alternate names.
@@ -97,117 +106,266 @@ for book_id, aliases in _BOOK_DEFINITIONS:
     for alias in aliases:
         BOOK_ALIASES[alias] = book_id
 
-# Book ID -> display name
-BOOK_DISPLAY = {}
-
-
-def _load_bible():
-    """Load the Knox Bible from NDJSON into a nested dict: {book_id: {chapter: {verse: text}}}."""
-    bible = {}
-    with open(BIBLE_PATH, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            bid = obj["book_id"]
-            ch = obj["chapter"]
-            vs = obj["verse"]
-            text = obj["text"]
-            if bid not in BOOK_DISPLAY:
-                BOOK_DISPLAY[bid] = obj["book_name"]
-            bible.setdefault(bid, {}).setdefault(ch, {})[vs] = text
-    return bible
+# Verse store: memory-mapped compiled Bible, or the parsed NDJSON as a fallback
+BIBLE = load_bible(BIBLE_PATH, BIBLE_COMPILED_PATH)
 
+# Book ID -> display name
+BOOK_DISPLAY = dict(BIBLE.display_names)
 
-BIBLE = _load_bible()
-
-# Regex to match bible verse references like:
+# Verse reference scanner.  References look like:
 #   John 3:16
 #   1 Cor 13:4-7
 #   Genesis 1:1-3
+#   Gen 1:31-2:3
 #   Ps 23
 #   Rom 8:28,31
-_VERSE_PATTERN = re.compile(
-    r"(?<!\w)"                        # not preceded by a word char
-    r"((?:[123]\s*)?[A-Za-z]+)"       # book name (optional leading number)
-    r"\s+"                            # space
-    r"(\d+)"                          # chapter
-    r"(?:\s*:\s*(\d+)"                # optional :verse_start
-    r"(?:\s*[-–]\s*(\d+))?"           # optional -verse_end
-    r")?"
-    r"(?!\w)",                        # not followed by a word char
-    re.IGNORECASE,
+#   Song of Songs 2:1
+#
+# Every reference contains a chapter number preceded by whitespace and a book
+# name, so the scanner only visits such numbers (a message without digits is
+# rejected by a single regex pass that cannot backtrack) and, from each one,
+# walks backwards through a trie of the reversed BOOK_ALIASES.  A candidate
+# costs at most one step per character of the longest alias, and plain chat
+# like "at 5" or "room 12" fails on the first character that no alias ends in.
+_TRIE_END = ""  # key marking a complete alias; never collides with a character
+
+# Aliases that are also everyday words ("it is 5", "at 6 am", "my job 2 weeks
+# ago").  Followed by a bare chapter they are not a reference: the two-letter
+# ones always need chapter:verse ("Is 5:1"), the longer ones a capital ("Job 3").
+_COMMON_WORD_ALIASES = {
+    "am", "ex", "ez", "hb", "hg", "is", "jo", "la", "mi", "na", "ob", "os", "pr", "ru", "sg", "ti", "ws",
+    "act", "acts", "bar", "col", "dan", "est", "job", "jon", "lam", "mal", "mark", "mat", "numbers", "sir",
+    "tit", "wisdom",
+}
+_BARE_ANY, _BARE_CAPITALIZED, _BARE_NEVER = range(3)
+
+
+def _build_alias_trie(aliases):
+    """Build a trie over the reversed aliases; whitespace in an alias is a single " " edge.
+
+    Each complete alias stores (book_id, rule), the rule saying when a bare
+    chapter after it counts as a reference.
+    """
+    root = {}
+    for alias, book_id in aliases.items():
+        if alias not in _COMMON_WORD_ALIASES:
+            rule = _BARE_ANY
+        else:
+            rule = _BARE_NEVER if len(alias) <= 2 else _BARE_CAPITALIZED
+        node = root
+        for ch in reversed(" ".join(alias.split())):
+            node = node.setdefault(ch, {})
+        node[_TRIE_END] = (book_id, rule)
+    return root
+
+
+_ALIAS_TRIE = _build_alias_trie(BOOK_ALIASES)
+
+_DIGIT_PATTERN = re.compile(r"[0-9]")
+# Candidate chapter numbers: whitespace and digits right after a letter (every alias ends
+# in one).  The lookbehind pins each whitespace run to a single starting point.
+_CHAPTER_PATTERN = re.compile(r"(?<=[A-Za-z])\s+([0-9]+)")
+# ":verse", ":verse-verse" or ":verse-chapter:verse" directly after a chapter number
+_VERSE_TAIL_PATTERN = re.compile(
+    r"\s*:\s*([0-9]+)(?:\s*[-–]\s*([0-9]+)(?:\s*:\s*([0-9]+))?)?(?!\w)"
 )
+# A further ", verse[-verse]" or "; chapter:verse[-...]" item in a list after a reference
+_LIST_ITEM_PATTERN = re.compile(
+    r"\s*[,;]\s*([0-9]+)(?:\s*:\s*([0-9]+))?(?:\s*[-–]\s*([0-9]+)(?:\s*:\s*([0-9]+))?)?(?!\w)"
+)
+# "1 Cor ..." after a comma starts a new reference, not another verse
+_BOOK_AHEAD_PATTERN = re.compile(r"\s*[A-Za-z]")
+
+# Most passages combined into one reply (each costs three components)
+MAX_PASSAGES = 10
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _match_book_before(text, end):
+    """Return (book_id, bare_chapter_ok) for the longest alias ending at text[end], or None."""
+    node = _ALIAS_TRIE
+    match = None
+    i = end
+    while i >= 0:
+        ch = text[i]
+        if ch.isspace():
+            node = node.get(" ")
+            while i > 0 and text[i - 1].isspace():
+                i -= 1
+        else:
+            node = node.get(ch.lower())
+        if node is None:
+            break
+        i -= 1
+        found = node.get(_TRIE_END)
+        # An alias must start at a word boundary ("romans", not "chromans")
+        if found is not None and (i < 0 or not _is_word_char(text[i])):
+            book_id, rule = found
+            match = book_id, rule == _BARE_ANY or (rule == _BARE_CAPITALIZED and text[i + 1].isupper())
+    return match
+
+
+def _expand_range(book_id, chapter, verse_start, end_chapter, verse_end):
+    """Split chapter:verse-end_chapter:verse_end into per-chapter (book_id, chapter, start, end) segments."""
+    if end_chapter is None or end_chapter == chapter:
+        if verse_end is not None and verse_end < verse_start:
+            return []
+        return [(book_id, chapter, verse_start, verse_end)]
+    if end_chapter < chapter:
+        return []
+    chapters = BIBLE.chapter_numbers(book_id)
+    if not chapters or end_chapter > chapters[-1]:
+        # "Gen 1:1-10000000:1" is not a passage; don't build a segment per chapter up to it
+        return []
+    last_verse = BIBLE.max_verse(book_id, chapter) or verse_start
+    segments = [(book_id, chapter, verse_start, max(last_verse, verse_start))]
+    # No reply shows more than MAX_PASSAGES passages; one more tells it the range was cut short
+    middle = range(chapter + 1, min(end_chapter, chapter + MAX_PASSAGES + 1))
+    segments.extend((book_id, ch, None, None) for ch in middle)
+    if len(segments) <= MAX_PASSAGES:
+        segments.append((book_id, end_chapter, 1, verse_end))
+    return segments
+
+
+def _scan_references(text):
+    """Yield (book_id, chapter, verse_start, verse_end) for each passage in text, in order.
+
+    Comma lists ("Rom 8:28,31") yield one passage per item and ranges that cross
+    chapters ("Gen 1:31-2:3") yield one passage per chapter.
+    """
+    consumed = 0
+    for m in _CHAPTER_PATTERN.finditer(text):
+        if m.start() < consumed:
+            continue
+        match = _match_book_before(text, m.start() - 1)
+        if match is None:
+            continue
+        book_id, bare_chapter_ok = match
+
+        chapter = int(m.group(1))
+        tail = _VERSE_TAIL_PATTERN.match(text, m.end())
+        if not tail:
+            if not bare_chapter_ok or m.end() < len(text) and _is_word_char(text[m.end()]):
+                continue
+            consumed = m.end()
+            yield book_id, chapter, None, None
+            continue
+
+        verse_start = int(tail.group(1))
+        if tail.group(3):
+            segments = _expand_range(book_id, chapter, verse_start, int(tail.group(2)), int(tail.group(3)))
+        else:
+            verse_end = int(tail.group(2)) if tail.group(2) else None
+            segments = _expand_range(book_id, chapter, verse_start, None, verse_end)
+        if not segments:
+            continue
+        consumed = tail.end()
+        yield from segments
+
+        # Continue through ", 31" / "; 9:1-4" list items
+        current = segments[-1][1]
+        while True:
+            item = _LIST_ITEM_PATTERN.match(text, consumed)
+            if not item:
+                break
+            first, second, third, fourth = item.groups()
+            if second is None and third is None and int(first) <= 3 \
+                    and _BOOK_AHEAD_PATTERN.match(text, item.end()):
+                break
+            if second is not None:
+                # chapter:verse[-verse | -chapter:verse]
+                current = int(first)
+                start = int(second)
+                if fourth is not None:
+                    segments = _expand_range(book_id, current, start, int(third), int(fourth))
+                else:
+                    segments = _expand_range(book_id, current, start, None,
+                                             int(third) if third else None)
+            elif fourth is not None:
+                # verse-chapter:verse
+                segments = _expand_range(book_id, current, int(first), int(third), int(fourth))
+            else:
+                segments = _expand_range(book_id, current, int(first), None,
+                                         int(third) if third else None)
+            if not segments:
+                break
+            consumed = item.end()
+            current = segments[-1][1]
+            yield from segments
 
 
 def parse_verse_reference(text):
     """Parse a bible verse reference string and return (book_id, chapter, verse_start, verse_end) or None."""
-    m = _VERSE_PATTERN.search(text)
-    if not m:
+    if not _DIGIT_PATTERN.search(text):
         return None
+    for ref in _scan_references(text):
+        return ref
+    return None
 
-    raw_book = m.group(1).strip().lower()
-    # Normalize numbered books: "1cor" / "1 cor" etc.
-    raw_book = re.sub(r"^([123])\s+", r"\1 ", raw_book)
-
-    book_id = BOOK_ALIASES.get(raw_book)
-    if book_id is None:
-        return None
-
-    chapter = int(m.group(2))
-    verse_start = int(m.group(3)) if m.group(3) else None
-    verse_end = int(m.group(4)) if m.group(4) else None
-
-    if verse_end is not None and verse_start is not None and verse_end < verse_start:
-        return None
 
-    return book_id, chapter, verse_start, verse_end
+def parse_all_references(text, limit=MAX_PASSAGES):
+    """Return every distinct (book_id, chapter, verse_start, verse_end) passage in text, up to `limit`."""
+    if not _DIGIT_PATTERN.search(text):
+        return []
+    refs = []
+    for ref in _scan_references(text):
+        if ref not in refs:
+            refs.append(ref)
+            if len(refs) >= limit:
+                break
+    return refs
 
 
 def lookup_verses(book_id, chapter, verse_start=None, verse_end=None):
     """Look up verses from the loaded bible data. Returns list of (verse_num, text) or None."""
-    book = BIBLE.get(book_id)
-    if not book:
-        return None
-    ch_data = book.get(chapter)
-    if not ch_data:
-        return None
+    verses = BIBLE.verses(book_id, chapter, verse_start, verse_end)
+    return verses if verses else None
+
 
+def _passage_title(book_id, chapter, verse_start, verse_end):
+    display_name = BOOK_DISPLAY.get(book_id, book_id)
     if verse_start is None:
-        # Whole chapter requested — return all verses
-        return sorted(ch_data.items())
+        return f"{display_name} {chapter}"
+    if verse_end is None or verse_end == verse_start:
+        return f"{display_name} {chapter}:{verse_start}"
+    return f"{display_name} {chapter}:{verse_start}-{verse_end}"
 
-    if verse_end is None:
-        verse_end = verse_start
 
-    verses = []
-    for v in range(verse_start, verse_end + 1):
-        if v in ch_data:
-            verses.append((v, ch_data[v]))
-    return verses if verses else None
+def _passage_body(verses):
+    return "\n".join(f"**{v}.** {text}" for v, text in verses)
 
 
-def format_bible_view(book_id, chapter, verse_start, verse_end, verses):
-    """Format looked-up verses as a Components V2 LayoutView."""
-    display_name = BOOK_DISPLAY.get(book_id, book_id)
+def _truncate(text, limit):
+    return text if len(text) <= limit else text[: max(limit - 3, 0)] + "..."
 
-    if verse_start is None:
-        title = f"{display_name} {chapter}"
-    elif verse_end is None or verse_end == verse_start:
-        title = f"{display_name} {chapter}:{verse_start}"
-    else:
-        title = f"{display_name} {chapter}:{verse_start}-{verse_end}"
 
-    body = "\n".join(f"**{v}.** {text}" for v, text in verses)
+# Rendered passages keyed by (book_id, chapter, verse_start, verse_end).  Values
+# are (title, body) with the body already cut to the 4000 char display limit,
+# or None for references with no verses, so repeat lookups are a dict hit.
+PASSAGE_CACHE = LRUCache(maxsize=1024)
 
-    # TextDisplay content limit is 4000 chars
-    if len(body) > 4000:
-        body = body[:3997] + "..."
 
+def render_passage(book_id, chapter, verse_start=None, verse_end=None):
+    """Return the (title, body) strings for a passage, or None if it has no verses."""
+    key = (book_id, chapter, verse_start, verse_end)
+    passage = PASSAGE_CACHE.get(key)
+    if passage is MISSING:
+        verses = lookup_verses(book_id, chapter, verse_start, verse_end)
+        if verses:
+            passage = (
+                _passage_title(book_id, chapter, verse_start, verse_end),
+                _truncate(_passage_body(verses), 4000),
+            )
+        else:
+            passage = None
+        PASSAGE_CACHE.put(key, passage)
+    return passage
+
+
+def _passage_view(title, body):
     view = LayoutView()
     container = Container(accent_colour=0x3E621B)  # dark green
     container.add_item(TextDisplay(f"### {title} - Knox Bible Translation"))
@@ -217,28 +375,377 @@ def format_bible_view(book_id, chapter, verse_start, verse_end, verses):
     return view
 
 
+def format_bible_view(book_id, chapter, verse_start, verse_end, verses):
+    """Format looked-up verses as a Components V2 LayoutView."""
+    title = _passage_title(book_id, chapter, verse_start, verse_end)
+
+    # TextDisplay content limit is 4000 chars
+    body = _truncate(_passage_body(verses), 4000)
+    return _passage_view(title, body)
+
+
+def format_bible_passages(passages):
+    """Format rendered passages as one Components V2 LayoutView.
+
+    `passages` is a list of (title, body) pairs from render_passage; a single
+    passage renders exactly like format_bible_view.  Past MAX_PASSAGES the
+    rest are dropped and the footer says so.
+    """
+    truncated = len(passages) > MAX_PASSAGES
+    passages = passages[:MAX_PASSAGES]
+    if len(passages) == 1:
+        return _passage_view(*passages[0])
+
+    footer = "-# Knox Bible Translation — CatholicBible.online, Baronius Press"
+    if truncated:
+        footer = f"-# Only the first {MAX_PASSAGES} passages are shown.\n{footer}"
+    headings = [f"### {title}" for title, _body in passages]
+    bodies = [body for _title, body in passages]
+    # All text in a message shares the 4000 char limit; hand out what is left
+    # shortest body first so short passages stay whole and long ones split the rest
+    budget = 4000 - len(footer) - sum(len(h) for h in headings)
+    order = sorted(range(len(bodies)), key=lambda i: len(bodies[i]))
+    for remaining, i in enumerate(order):
+        share = budget // (len(order) - remaining)
+        bodies[i] = _truncate(bodies[i], share)
+        budget -= len(bodies[i])
+
+    view = LayoutView()
+    container = Container(accent_colour=0x3E621B)  # dark green
+    for i, (heading, body) in enumerate(zip(headings, bodies)):
+        if i:
+            container.add_item(Separator())
+        container.add_item(TextDisplay(heading))
+        container.add_item(TextDisplay(body))
+    container.add_item(TextDisplay(footer))
+    view.add_item(container)
+    return view
+
+
+# Suggestions for the /verse command's autocomplete, which must answer within
+# Discord's deadline on every keystroke.  Everything is precomputed at import:
+# each prefix of every book name and alias maps to its matching book ids, and
+# chapter and verse counts come from per-book and per-chapter maxima.
+MAX_SUGGESTIONS = 25  # Discord shows at most 25 autocomplete choices
+
+
+def _normalize_name(text):
+    return " ".join(text.lower().replace(".", " ").replace("_", " ").split())
+
+
+def _build_book_prefixes():
+    """Map every prefix of every book name to up to MAX_SUGGESTIONS book ids.
+
+    Books whose name equals the prefix come first, then canonical order.
+    """
+    order = {book_id: i for i, book_id in enumerate(BIBLE.book_ids())}
+    names = [(_normalize_name(alias), book_id) for alias, book_id in BOOK_ALIASES.items()]
+    names += [(_normalize_name(name), book_id) for book_id, name in BOOK_DISPLAY.items()]
+    names += [(_normalize_name(book_id), book_id) for book_id in order]
+    matches = {}
+    for name, book_id in names:
+        if book_id not in order:
+            continue
+        for end in range(len(name) + 1):
+            exact = end == len(name)
+            books = matches.setdefault(name[:end], {})
+            books[book_id] = books.get(book_id, False) or exact
+    return {
+        prefix: tuple(sorted(books, key=lambda b: (not books[b], order[b]))[:MAX_SUGGESTIONS])
+        for prefix, books in matches.items()
+    }
+
+
+def _build_book_names():
+    """Map each full book id, name and alias (normalized) to its book id."""
+    names = {}
+    for book_id in BIBLE.book_ids():
+        names[_normalize_name(book_id)] = book_id
+    for book_id, name in BOOK_DISPLAY.items():
+        names.setdefault(_normalize_name(name), book_id)
+    for alias, book_id in BOOK_ALIASES.items():
+        names.setdefault(_normalize_name(alias), book_id)
+    return {name: book_id for name, book_id in names.items() if book_id in BOOK_CHAPTERS}
+
+
+_BOOK_PREFIXES = _build_book_prefixes()
+BOOK_CHAPTERS = {book_id: max(BIBLE.chapter_numbers(book_id), default=0) for book_id in BIBLE.book_ids()}
+CHAPTER_VERSES = {
+    (book_id, chapter): BIBLE.max_verse(book_id, chapter)
+    for book_id in BIBLE.book_ids()
+    for chapter in BIBLE.chapter_numbers(book_id)
+}
+_BOOK_NAMES = _build_book_names()
+
+
+def book_suggestions(prefix):
+    """Book ids whose name or an alias starts with `prefix`, best matches first."""
+    return _BOOK_PREFIXES.get(_normalize_name(prefix), ())
+
+
+def resolve_book(text):
+    """Book id for a book id, name, alias or unambiguous prefix, or None."""
+    if text in BOOK_CHAPTERS:
+        return text
+    name = _normalize_name(text)
+    if name in _BOOK_NAMES:
+        return _BOOK_NAMES[name]
+    # A prefix must pick out one book: "j" or "1" could mean any of several
+    matches = _BOOK_PREFIXES.get(name, ())
+    return matches[0] if len(matches) == 1 else None
+
+
+def _number_suggestions(prefix, maximum):
+    """Numbers 1..maximum whose decimal form starts with `prefix`, in order, at most MAX_SUGGESTIONS."""
+    prefix = prefix.strip()
+    if not prefix:
+        return list(range(1, min(maximum, MAX_SUGGESTIONS) + 1))
+    if not prefix.isdigit() or prefix.startswith("0"):
+        return []
+    # The numbers starting with p are p, p0-p9, p00-p99, ...; walk those blocks
+    # instead of every number up to the maximum
+    base = int(prefix)
+    result = []
+    low, high = base, base
+    while low <= maximum and len(result) < MAX_SUGGESTIONS:
+        result.extend(range(low, min(high, maximum) + 1))
+        low, high = low * 10, high * 10 + 9
+    return result[:MAX_SUGGESTIONS]
+
+
+def chapter_suggestions(book_id, prefix):
+    return _number_suggestions(prefix, BOOK_CHAPTERS.get(book_id, 0))
+
+
+def verse_suggestions(book_id, chapter, prefix):
+    return _number_suggestions(prefix, CHAPTER_VERSES.get((book_id, chapter)) or 0)
+
+
+# Inverted word index over every verse, built on the first search.
+# Verses are numbered in canonical order; each document id maps back to its
+# (book_id, chapter, verse) reference through the refs list.  Postings are kept
+# as parallel typed arrays (document ids / term frequencies / offsets into a
+# flat array of token positions) so the ~35k verse index costs a few megabytes
+# rather than millions of tuples, and phrases are matched from the positions
+# without re-reading any verse text.
+_TOKEN_PATTERN = re.compile(r"\w+")
+_PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+# BM25 tuning parameters (the usual defaults)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+
+
+def _tokenize(text):
+    """Split text into normalized (lower-cased) word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower().replace("\u2019", "'"))
+
+
+def _build_search_index(bible):
+    """Build the inverted index plus per-verse refs and lengths.
+
+    The index maps each token to ``(doc_ids, term_freqs, starts, positions)``:
+    the token's positions in verse ``doc_ids[i]`` are
+    ``positions[starts[i] : starts[i] + term_freqs[i]]``.
+    """
+    refs = []
+    lengths = array("I")
+    postings = {}
+    for book_id, chapter, verse, text in bible.iter_verses():
+        doc_id = len(refs)
+        refs.append((book_id, chapter, verse))
+        tokens = _tokenize(text)
+        lengths.append(len(tokens))
+        token_positions = {}
+        for position, token in enumerate(tokens):
+            token_positions.setdefault(token, []).append(position)
+        for token, found in token_positions.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = (array("I"), array("I"), array("I"), array("H"))
+            entry[0].append(doc_id)
+            entry[1].append(len(found))
+            entry[2].append(len(entry[3]))
+            entry[3].extend(found)
+    avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+    return postings, refs, lengths, avg_length
+
+
+_search_index = None
+_search_index_lock = threading.Lock()
+
+
+def _get_search_index():
+    """Return the search index, building it on first use so startup stays fast.
+
+    Searches may run in worker threads, so the build is guarded to happen once.
+    """
+    global _search_index
+    if _search_index is None:
+        with _search_index_lock:
+            if _search_index is None:
+                _search_index = _build_search_index(BIBLE)
+    return _search_index
+
+
+def warm_search_index():
+    """Build the search index now rather than on the first search."""
+    _get_search_index()
+
+
+def _parse_query(query):
+    """Split a search query into (terms, phrases).
+
+    Double-quoted parts are phrases whose words must appear consecutively;
+    every word in the query (quoted or not) must appear in a matching verse.
+    """
+    phrases = []
+    for raw in _PHRASE_PATTERN.findall(query):
+        tokens = _tokenize(raw)
+        if len(tokens) > 1:
+            phrases.append(tokens)
+    terms = list(dict.fromkeys(_tokenize(query)))
+    return terms, phrases
+
+
+def _token_positions(entry, doc_id):
+    """The positions of a posting list's token in verse `doc_id` (which must contain it)."""
+    doc_ids, term_freqs, starts, positions = entry
+    i = bisect_left(doc_ids, doc_id)
+    return positions[starts[i] : starts[i] + term_freqs[i]]
+
+
+def _contains_phrase(index, doc_id, phrase):
+    """Return True if `phrase` occurs as a consecutive run of tokens in verse `doc_id`."""
+    candidates = set(_token_positions(index[phrase[0]], doc_id))
+    for offset, token in enumerate(phrase[1:], 1):
+        following = _token_positions(index[token], doc_id)
+        candidates = {start for start in candidates if start + offset in following}
+        if not candidates:
+            return False
+    return True
+
+
+def _rank_key(item):
+    """Sort key for (doc_id, score) pairs: best score first, then canonical order."""
+    return -item[1], item[0]
+
+
+def _score_terms(terms):
+    """BM25 scores {doc_id: score} of the verses containing every term."""
+    index, verse_refs, verse_lengths, avg_verse_length = _get_search_index()
+    entries = []
+    for term in terms:
+        entry = index.get(term)
+        if entry is None:
+            return {}
+        entries.append(entry)
+    # Intersect starting from the rarest term so the candidate set stays small
+    entries.sort(key=lambda e: len(e[0]))
+
+    total_docs = len(verse_refs)
+    scores = None
+    for doc_ids, term_freqs, _starts, _positions in entries:
+        df = len(doc_ids)
+        idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+        next_scores = {}
+        for doc_id, tf in zip(doc_ids, term_freqs):
+            if scores is not None:
+                base = scores.get(doc_id)
+                if base is None:
+                    continue
+            else:
+                base = 0.0
+            norm = _BM25_K1 * (1 - _BM25_B + _BM25_B * verse_lengths[doc_id] / avg_verse_length)
+            next_scores[doc_id] = base + idf * tf * (_BM25_K1 + 1) / (tf + norm)
+        scores = next_scores
+        if not scores:
+            return {}
+    return scores
+
+
+def _verse_hit(doc_id):
+    """(book_id, chapter, verse, text) for a search index document id."""
+    book_id, chapter, verse = _get_search_index()[1][doc_id]
+    return book_id, chapter, verse, BIBLE.verse_text(book_id, chapter, verse)
+
+
+def _matches_phrases(doc_id, phrases):
+    # Every phrase word is also a query term, so scored verses contain them all
+    index = _get_search_index()[0]
+    return all(_contains_phrase(index, doc_id, phrase) for phrase in phrases)
+
+
 def search_verses(query, limit=5):
-    """Search the Bible for verses containing the query string (case-insensitive).
+    """Search the Bible for verses containing every word of the query.
+
+    Words are matched whole and case-insensitively; double-quoted parts of the
+    query must appear as an exact phrase.  Results are ranked by BM25 relevance
+    (ties in canonical order) and only the postings for the query's own words
+    are read.
 
     Returns a list of (book_id, chapter, verse, text) tuples, up to `limit` results.
     """
-    query_lower = query.lower()
+    terms, phrases = _parse_query(query)
+    if not terms:
+        return []
+    scores = _score_terms(terms)
+
     results = []
-    for book_id, chapters in BIBLE.items():
-        for chapter, verses in chapters.items():
-            for verse, text in verses.items():
-                if query_lower in text.lower():
-                    results.append((book_id, chapter, verse, text))
-                    if len(results) >= limit:
-                        return results
+    if phrases:
+        # Phrase checks may reject candidates, so walk the full ranking
+        ranked = sorted(scores.items(), key=_rank_key)
+    else:
+        ranked = heapq.nsmallest(limit, scores.items(), key=_rank_key)
+    for doc_id, _score in ranked:
+        if phrases and not _matches_phrases(doc_id, phrases):
+            continue
+        results.append(_verse_hit(doc_id))
+        if len(results) >= limit:
+            break
     return results
 
 
-def format_bible_search_view(query, results):
-    """Format search results as a Components V2 LayoutView."""
-    view = LayoutView()
+# Full ranked result sets (arrays of document ids, 4 bytes a hit) by normalized
+# query, so page turns and repeated searches don't rescan the index
+SEARCH_PAGE_SIZE = 5
+SEARCH_CACHE_TTL = 900
+SEARCH_CACHE_MAX_HITS = 500_000  # about 2 MB of cached ids
+SEARCH_CACHE = TTLCache(ttl=SEARCH_CACHE_TTL, max_weight=SEARCH_CACHE_MAX_HITS)
+
+
+def search_key(query):
+    """Normalize `query` to the hashable (terms, phrases) key used by rank_hits and SEARCH_CACHE."""
+    terms, phrases = _parse_query(query)
+    return tuple(terms), tuple(tuple(phrase) for phrase in phrases)
+
+
+def rank_hits(key):
+    """Rank every verse matching a search_key as an ``array`` of search index document ids.
+
+    A plain function of its (picklable) key, so it can run in a worker thread
+    or process; it does not touch SEARCH_CACHE.
+    """
+    terms, phrases = key
+    if not terms:
+        return array("I")
+    phrases = [list(phrase) for phrase in phrases]
+    ranked = sorted(_score_terms(terms).items(), key=_rank_key)
+    return array("I", (doc_id for doc_id, _score in ranked
+                       if not phrases or _matches_phrases(doc_id, phrases)))
+
+
+def search_page(hits, page, per_page=SEARCH_PAGE_SIZE):
+    """The (book_id, chapter, verse, text) results on page `page` (from 0) of `hits`."""
+    return [_verse_hit(doc_id) for doc_id in hits[page * per_page : (page + 1) * per_page]]
+
+
+def _search_container(query, results, total=None, page=0, pages=1):
     container = Container(accent_colour=0x3E621B)  # dark green
-    container.add_item(TextDisplay(f'### Bible Search: "{query}"'))
+    header = f'### Bible Search: "{query}"'
+    if total:
+        header += f"\n-# {total} matching verse{'s' if total != 1 else ''}"
+    container.add_item(TextDisplay(header))
 
     if not results:
         container.add_item(TextDisplay("No matching verses found."))
@@ -255,6 +762,69 @@ def format_bible_search_view(query, results):
             body = body[:3997] + "..."
         container.add_item(TextDisplay(body))
 
-    container.add_item(TextDisplay("-# Knox Bible Translation"))
-    view.add_item(container)
-    return view
+    footer = "-# Knox Bible Translation"
+    if pages > 1:
+        footer += f" · Page {page + 1}/{pages}"
+    container.add_item(TextDisplay(footer))
+    return container
+
+
+class SearchResultsView(LayoutView):
+    """One page of a search's ranked hits, with Previous/Next buttons to turn pages.
+
+    Pages are cut from the `hits` array held by the view, so turning a page
+    only looks up the texts of the verses shown.  Only `user_id` (the person
+    who searched) may turn pages.
+    """
+
+    def __init__(self, query, hits, *, user_id=None, page=0, per_page=SEARCH_PAGE_SIZE, timeout=600):
+        super().__init__(timeout=timeout)
+        self.query = query
+        self.hits = hits
+        self.user_id = user_id
+        self.per_page = per_page
+        self.pages = max(1, -(-len(hits) // per_page))
+        self.page = min(max(page, 0), self.pages - 1)
+        # Set by the caller to the sent message, so the buttons can be removed on timeout
+        self.message = None
+        self._render()
+
+    def _render(self, buttons=True):
+        self.clear_items()
+        results = search_page(self.hits, self.page, self.per_page)
+        container = _search_container(self.query, results, len(self.hits), self.page, self.pages)
+        if buttons and self.pages > 1:
+            previous = Button(label="Previous", style=discord.ButtonStyle.secondary, disabled=self.page == 0)
+            previous.callback = self._previous
+            following = Button(label="Next", style=discord.ButtonStyle.secondary,
+                               disabled=self.page >= self.pages - 1)
+            following.callback = self._next
+            container.add_item(ActionRow(previous, following))
+        self.add_item(container)
+
+    async def interaction_check(self, interaction):
+        if self.user_id is not None and interaction.user.id != self.user_id:
+            await interaction.response.send_message("Only the person who searched can turn these pages.",
+                                                    ephemeral=True)
+            return False
+        return True
+
+    async def _turn(self, interaction, step):
+        self.page = min(max(self.page + step, 0), self.pages - 1)
+        self._render()
+        await interaction.response.edit_message(view=self)
+
+    async def _previous(self, interaction):
+        await self._turn(interaction, -1)
+
+    async def _next(self, interaction):
+        await self._turn(interaction, 1)
+
+    async def on_timeout(self):
+        if self.message is None or self.pages <= 1:
+            return
+        self._render(buttons=False)
+        try:
+            await self.message.edit(view=self)
+        except discord.HTTPException:
+            pass
@@ -0,0 +1,278 @@
+"""Knox Bible storage backends.
+
+The Bible ships as NDJSON (``knox.json``, one verse object per line).  Parsing
+that at every start builds ~35k dicts and strings, so ``compile_bible`` turns it
+into a compact binary file that ``CompiledBible`` memory-maps instead:
+
+    header   magic, source size/mtime (staleness check), section sizes
+    meta     JSON list of books: [book_id, book_name, [[chapter, first_verse, slots], ...]]
+    offsets  uint32 array, one entry per verse slot plus a final sentinel
+    blob     every verse's UTF-8 text, concatenated in canonical order
+
+Each chapter owns a contiguous run of slots, one per verse number from its
+first verse to its last; a verse missing from the source is an empty slot.
+Verse text is sliced straight out of the mapping and decoded on demand.
+
+Run ``python bible_store.py [knox.json] [knox.bin]`` to compile.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+log = logging.getLogger("lucebot")
+
+_MAGIC = b"KNOXBIN1"
+# magic, source size, source mtime_ns, meta length, slot count, blob length
+_HEADER = struct.Struct("=8sQqIIQ")
+
+
+def _source_stamp(source_path):
+    """Return (size, mtime_ns) for the NDJSON source, or None if it is missing."""
+    try:
+        st = os.stat(source_path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def read_ndjson(path):
+    """Read the NDJSON Bible into ({book_id: {chapter: {verse: text}}}, {book_id: book_name})."""
+    bible = {}
+    names = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            bid = obj["book_id"]
+            if bid not in names:
+                names[bid] = obj["book_name"]
+            bible.setdefault(bid, {}).setdefault(obj["chapter"], {})[obj["verse"]] = obj["text"]
+    return bible, names
+
+
+class DictBible:
+    """Bible held in memory as nested dicts, parsed from the NDJSON source."""
+
+    def __init__(self, bible, names):
+        self._bible = bible
+        self.display_names = names
+
+    @classmethod
+    def from_ndjson(cls, path):
+        return cls(*read_ndjson(path))
+
+    def book_ids(self):
+        return list(self._bible)
+
+    def chapter_numbers(self, book_id):
+        return sorted(self._bible.get(book_id, ()))
+
+    def max_verse(self, book_id, chapter):
+        ch_data = self._bible.get(book_id, {}).get(chapter)
+        return max(ch_data) if ch_data else None
+
+    def verse_text(self, book_id, chapter, verse):
+        return self._bible.get(book_id, {}).get(chapter, {}).get(verse)
+
+    def verses(self, book_id, chapter, verse_start=None, verse_end=None):
+        """Return [(verse, text), ...] for a chapter, optionally limited to a verse range."""
+        ch_data = self._bible.get(book_id, {}).get(chapter)
+        if not ch_data:
+            return []
+        if verse_start is None:
+            return sorted(ch_data.items())
+        if verse_end is None:
+            verse_end = verse_start
+        return [(v, ch_data[v]) for v in range(verse_start, verse_end + 1) if v in ch_data]
+
+    def iter_verses(self):
+        """Yield (book_id, chapter, verse, text) for every verse in canonical order."""
+        for book_id, chapters in self._bible.items():
+            for chapter, verses in chapters.items():
+                for verse, text in sorted(verses.items()):
+                    yield book_id, chapter, verse, text
+
+    def close(self):
+        pass
+
+
+class CompiledBible:
+    """Read-only Bible backed by a memory-mapped file written by ``compile_bible``."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, src_size, src_mtime, meta_len, slots, blob_len = _HEADER.unpack_from(self._mm, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a compiled Knox Bible")
+            self.source_stamp = (src_size, src_mtime)
+
+            meta_start = _HEADER.size
+            offsets_start = meta_start + meta_len
+            self._blob_start = offsets_start + 4 * (slots + 1)
+            if self._blob_start + blob_len != len(self._mm):
+                raise ValueError(f"{path} is truncated or corrupt")
+
+            view = memoryview(self._mm)
+            books = json.loads(bytes(view[meta_start:offsets_start]).rstrip(b"\0"))
+            self._offsets = view[offsets_start : self._blob_start].cast("I")
+            self._blob = view[self._blob_start :]
+        except Exception:
+            self.close()
+            raise
+
+        self.display_names = {}
+        # {book_id: {chapter: (first_verse, first_slot, slot_count)}}
+        self._chapters = {}
+        slot = 0
+        for book_id, book_name, chapters in books:
+            self.display_names[book_id] = book_name
+            book = self._chapters[book_id] = {}
+            for chapter, first_verse, count in chapters:
+                book[chapter] = (first_verse, slot, count)
+                slot += count
+
+    def is_fresh(self, source_path):
+        """True unless the NDJSON source exists and differs from the one compiled."""
+        stamp = _source_stamp(source_path)
+        return stamp is None or stamp == self.source_stamp
+
+    def _text(self, slot):
+        start = self._offsets[slot]
+        end = self._offsets[slot + 1]
+        if start == end:
+            return None
+        return str(self._blob[start:end], "utf-8")
+
+    def book_ids(self):
+        return list(self._chapters)
+
+    def chapter_numbers(self, book_id):
+        return sorted(self._chapters.get(book_id, ()))
+
+    def max_verse(self, book_id, chapter):
+        entry = self._chapters.get(book_id, {}).get(chapter)
+        if entry is None:
+            return None
+        first_verse, first_slot, count = entry
+        # Trailing slots are never empty: the last slot is the chapter's last verse
+        return first_verse + count - 1
+
+    def verse_text(self, book_id, chapter, verse):
+        entry = self._chapters.get(book_id, {}).get(chapter)
+        if entry is None:
+            return None
+        first_verse, first_slot, count = entry
+        if not first_verse <= verse < first_verse + count:
+            return None
+        return self._text(first_slot + verse - first_verse)
+
+    def verses(self, book_id, chapter, verse_start=None, verse_end=None):
+        """Return [(verse, text), ...] for a chapter, optionally limited to a verse range."""
+        entry = self._chapters.get(book_id, {}).get(chapter)
+        if entry is None:
+            return []
+        first_verse, first_slot, count = entry
+        last_verse = first_verse + count - 1
+        if verse_start is None:
+            lo, hi = first_verse, last_verse
+        else:
+            lo = max(verse_start, first_verse)
+            hi = min(verse_end if verse_end is not None else verse_start, last_verse)
+        result = []
+        for verse in range(lo, hi + 1):
+            text = self._text(first_slot + verse - first_verse)
+            if text is not None:
+                result.append((verse, text))
+        return result
+
+    def iter_verses(self):
+        """Yield (book_id, chapter, verse, text) for every verse in canonical order."""
+        for book_id, chapters in self._chapters.items():
+            for chapter, (first_verse, first_slot, count) in chapters.items():
+                for i in range(count):
+                    text = self._text(first_slot + i)
+                    if text is not None:
+                        yield book_id, chapter, first_verse + i, text
+
+    def close(self):
+        """Release the mapping (views into it must not be used afterwards)."""
+        for attr in ("_blob", "_offsets"):
+            view = self.__dict__.pop(attr, None)
+            if view is not None:
+                view.release()
+        self._mm.close()
+
+
+def compile_bible(source_path, output_path):
+    """Compile the NDJSON Bible at `source_path` into the binary format at `output_path`."""
+    stamp = _source_stamp(source_path)
+    if stamp is None:
+        raise FileNotFoundError(source_path)
+    bible, names = read_ndjson(source_path)
+
+    books = []
+    offsets = array("I", [0])
+    blob = bytearray()
+    for book_id, chapters in bible.items():
+        chapter_meta = []
+        for chapter in sorted(chapters):
+            verses = chapters[chapter]
+            first_verse, last_verse = min(verses), max(verses)
+            for verse in range(first_verse, last_verse + 1):
+                text = verses.get(verse)
+                if text:
+                    blob += text.encode("utf-8")
+                offsets.append(len(blob))
+            chapter_meta.append([chapter, first_verse, last_verse - first_verse + 1])
+        books.append([book_id, names[book_id], chapter_meta])
+
+    meta = json.dumps(books, separators=(",", ":")).encode("utf-8")
+    meta += b"\0" * (-(_HEADER.size + len(meta)) % 4)  # keep the offset table aligned
+    slots = len(offsets) - 1
+    header = _HEADER.pack(_MAGIC, stamp[0], stamp[1], len(meta), slots, len(blob))
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(meta)
+        f.write(offsets.tobytes())
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+    return slots
+
+
+def load_bible(source_path, compiled_path):
+    """Open the compiled Bible if it is present and current, else parse the NDJSON source."""
+    if os.path.exists(compiled_path):
+        try:
+            store = CompiledBible(compiled_path)
+        except (OSError, ValueError):
+            log.warning("Could not open compiled Bible %s; using %s", compiled_path, source_path,
+                        exc_info=True)
+        else:
+            if store.is_fresh(source_path):
+                return store
+            log.warning("Compiled Bible %s is stale; using %s", compiled_path, source_path)
+            store.close()
+    return DictBible.from_ndjson(source_path)
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(here, "knox.json")
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.join(here, "knox.bin")
+    count = compile_bible(source, output)
+    print(f"Compiled {source} -> {output} ({count} verse slots, {os.path.getsize(output)} bytes)")
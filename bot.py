@@ -1,18 +1,34 @@
+import asyncio
 import datetime
 import logging
 import os
+import signal
+import time
 
 import discord
 from discord.ext import tasks
 from dotenv import load_dotenv
 
-from readings import get_daily_readings, format_for_discord
+import http_client
+import metrics
+import subscriptions
+from cache import MISSING, RenderCache
+from command_sync import sync_if_changed
+from cooldowns import Cooldowns, parse_cooldowns
+from embeds import pack_embeds
+from readings import get_daily_readings, format_for_discord, set_readings_source
 from latin_readings import get_latin_readings, format_latin_for_discord
-from quotes import get_daily_quote, format_quote_for_discord
+from metrics import HANDLER_SECONDS, SEARCHES, SEARCH_SECONDS, VERSE_PARSE_ATTEMPTS, VERSE_PARSE_HITS
+from quotes import get_daily_quote, next_quote, format_quote_for_discord, flush_rotation
 from saints import get_daily_saint
+from send_queue import BROADCAST, INTERACTIVE, SendQueue
+from sharding import parse_shard_ids, shard_for_guild
+from subscriptions import Subscription
+from worker_pool import PoolBusy, WorkerPool
 from bible import (
-    parse_verse_reference, lookup_verses, format_bible_view,
-    search_verses, format_bible_search_view,
+    MAX_PASSAGES, PASSAGE_CACHE, parse_all_references, render_passage, format_bible_passages,
+    SEARCH_CACHE, SearchResultsView, search_key, rank_hits, warm_search_index,
+    BOOK_DISPLAY, book_suggestions, resolve_book, chapter_suggestions, verse_suggestions,
 )
 
 load_dotenv()
@@ -22,129 +38,559 @@ CHANNEL_ID = os.getenv("DISCORD_CHANNEL_ID")
 QUOTE_CHANNEL_ID = os.getenv("DISCORD_QUOTE_CHANNEL_ID")
 SAINT_CHANNEL_ID = os.getenv("DISCORD_SAINT_CHANNEL_ID")
 READINGS_TYPE = os.getenv("READINGS_TYPE", "novus_ordo").lower()
+READINGS_SOURCE = os.getenv("READINGS_SOURCE", "auto").lower()
+BIBLE_CACHE_SIZE = int(os.getenv("BIBLE_CACHE_SIZE", "1024"))
+COMMAND_COOLDOWNS = parse_cooldowns(os.getenv("COMMAND_COOLDOWNS", ""))
+SEARCH_EXECUTOR = os.getenv("SEARCH_EXECUTOR", "thread").lower()
+SEARCH_WORKERS = int(os.getenv("SEARCH_WORKERS", "2"))
+SEARCH_MAX_PENDING = int(os.getenv("SEARCH_MAX_PENDING", "16"))
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", "10"))
+# Set by supervisor.py for each worker process; unset, one process runs every shard
+SHARD_COUNT = int(os.getenv("SHARD_COUNT") or 0) or None
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS", ""))
+# Prometheus metrics on http://METRICS_HOST:METRICS_PORT/metrics; off unless a port is set
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 0) or None
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
 
 if not TOKEN:
     raise RuntimeError("DISCORD_TOKEN not set in .env")
-if not CHANNEL_ID:
-    raise RuntimeError("DISCORD_CHANNEL_ID not set in .env")
-CHANNEL_ID = int(CHANNEL_ID)
+CHANNEL_ID = int(CHANNEL_ID) if CHANNEL_ID else None
 QUOTE_CHANNEL_ID = int(QUOTE_CHANNEL_ID) if QUOTE_CHANNEL_ID else None
 SAINT_CHANNEL_ID = int(SAINT_CHANNEL_ID) if SAINT_CHANNEL_ID else None
+if SHARD_IDS and not SHARD_COUNT:
+    raise RuntimeError("SHARD_IDS needs SHARD_COUNT")
+PASSAGE_CACHE.resize(BIBLE_CACHE_SIZE)
+set_readings_source(READINGS_SOURCE)
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("lucebot")
-
-EST = datetime.timezone(datetime.timedelta(hours=-5))
+# Startup is timed from here (after the Bible and quotes have loaded) to the first on_ready
+_started = time.monotonic()
+_ready = False
+
+# The scheduler wakes every SCHEDULE_SLOT minutes (UTC) and posts to each subscribed
+# channel in the first slot of its local posting hour
+SCHEDULE_SLOT = 15
+_SLOT_TIMES = [
+    datetime.time(hour=h, minute=m, tzinfo=datetime.timezone.utc)
+    for h in range(24)
+    for m in range(0, 60, SCHEDULE_SLOT)
+]
+# Daily posts are fetched and formatted this long before they are due (and retried
+# every slot until then), so posting time only has to send them
+PREWARM_LEAD = datetime.timedelta(hours=2)
 
 intents = discord.Intents.default()
 intents.message_content = True
-client = discord.Client(intents=intents)
+client = discord.AutoShardedClient(intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS)
 tree = discord.app_commands.CommandTree(client)
+# Every channel message goes out through this rate-limited queue
+outbox = SendQueue()
+# Bible searches run here, off the event loop; the index is built as the pool starts
+search_pool = WorkerPool(
+    SEARCH_EXECUTOR, SEARCH_WORKERS, max_pending=SEARCH_MAX_PENDING, timeout=SEARCH_TIMEOUT,
+    initializer=warm_search_index,
+)
 
 
-async def post_readings(channel):
-    """Fetch readings and send them to the given channel."""
-    mass = await get_daily_readings()
-    if mass is None:
-        await channel.send("Could not fetch today's readings.")
-        return
+def _env_subscriptions():
+    """Subscriptions from the DISCORD_*_CHANNEL_ID settings: 7 AM EST, as for a single server."""
+    items = {}
+    for channel_id, item in ((CHANNEL_ID, "readings"), (QUOTE_CHANNEL_ID, "quote"), (SAINT_CHANNEL_ID, "saint")):
+        if channel_id:
+            items.setdefault(channel_id, []).append(item)
+    readings_type = "latin" if READINGS_TYPE == "latin" else "novus_ordo"
+    return {
+        channel_id: Subscription(channel_id, None, readings_type, tuple(channel_items), 7, "EST")
+        for channel_id, channel_items in items.items()
+    }
 
-    embeds = format_for_discord(mass)
 
-    # Discord allows max 10 embeds per message; batch if needed
-    for i in range(0, len(embeds), 10):
-        await channel.send(embeds=embeds[i : i + 10])
+ENV_SUBSCRIPTIONS = _env_subscriptions()
 
+# Built daily posts by variant (item, readings_type, date), shared by every channel that wants one
+_prepared = {}
+# {(channel_id, item): date} of the last daily post, so a repeated slot never double-posts
+_posted = {}
+# {(channel_id, item): date} of daily posts that couldn't be built; every slot retries them that day
+_retry = {}
+# Packed, serialized readings embeds by (readings_type, date), so each day is formatted once
+RENDER_CACHE = RenderCache()
 
-async def post_latin_readings(channel):
-    """Fetch TLM propers and send them to the given channel."""
-    data = await get_latin_readings()
+COOLDOWNS = Cooldowns(COMMAND_COOLDOWNS)
+_COOLDOWN_HINTS = {
+    "channel": "-# `!{command}` was just posted here; see above.",
+    "user": "-# Please wait {seconds}s before using `!{command}` again.",
+}
+
+
+def _render_embeds(embeds):
+    """Pack embeds into messages and serialize them, for RENDER_CACHE."""
+    return [[embed.to_dict() for embed in group] for group in pack_embeds(embeds)]
+
+
+def _payload_messages(payload):
+    """Turn a cached serialized payload back into a list of send() kwargs."""
+    return [{"embeds": [discord.Embed.from_dict(data) for data in group]} for group in payload]
+
+
+async def build_readings(date=None):
+    """Fetch and format Novus Ordo readings as a list of send() kwargs, or None on failure."""
+    date = date or datetime.date.today()
+    mass = await get_daily_readings(date)
+    if mass is None:
+        return None
+    payload = RENDER_CACHE.get(("novus_ordo", date), mass, lambda m: _render_embeds(format_for_discord(m)))
+    return _payload_messages(payload)
+
+
+async def build_latin_readings(date=None):
+    """Fetch and format TLM propers as a list of send() kwargs, or None on failure."""
+    date = date or datetime.date.today()
+    data = await get_latin_readings(date)
     if data is None:
-        await channel.send("Could not fetch today's Traditional Latin Mass readings.")
-        return
+        return None
+    payload = RENDER_CACHE.get(("latin", date), data, lambda d: _render_embeds(format_latin_for_discord(d)))
+    return _payload_messages(payload)
+
+
+async def build_quote(date=None):
+    """Format the saint quote for `date` (default today) as a list of send() kwargs."""
+    return [{"embed": format_quote_for_discord(get_daily_quote(date))}]
+
+
+async def build_saint(date=None):
+    """Fetch and format the saint of the day as a list of send() kwargs.
+
+    Returns an empty list when there is no feast, or None on fetch errors.
+    """
+    result = await get_daily_saint(date)
+    if result is None:
+        return None
+    if result == "no_feast":
+        return []
+    return [{"embeds": result}]
+
+
+async def send_messages(channel, messages, priority=BROADCAST):
+    for kwargs in messages:
+        await outbox.send(channel, priority=priority, **kwargs)
 
-    embeds = format_latin_for_discord(data)
 
-    for i in range(0, len(embeds), 10):
-        await channel.send(embeds=embeds[i : i + 10])
+async def reply(channel, *args, **kwargs):
+    """Send an interactive reply, ahead of any queued broadcasts."""
+    return await outbox.send(channel, *args, priority=INTERACTIVE, **kwargs)
+
+
+async def post_readings(channel):
+    """Fetch readings and send them to the given channel; returns False if the fetch failed."""
+    messages = await build_readings()
+    if messages is None:
+        await reply(channel, "Could not fetch today's readings.")
+        return False
+    await send_messages(channel, messages, INTERACTIVE)
+    return True
+
+
+async def post_latin_readings(channel):
+    """Fetch TLM propers and send them to the given channel; returns False if the fetch failed."""
+    messages = await build_latin_readings()
+    if messages is None:
+        await reply(channel, "Could not fetch today's Traditional Latin Mass readings.")
+        return False
+    await send_messages(channel, messages, INTERACTIVE)
+    return True
 
 
 async def post_quote(channel):
-    """Fetch a random saint quote and send it to the given channel."""
-    quote = get_daily_quote()
-    embed = format_quote_for_discord(quote)
-    await channel.send(embed=embed)
+    """Send the next quote of the no-repeat rotation to the given channel."""
+    await reply(channel, embed=format_quote_for_discord(next_quote()))
 
 
 async def post_saint(channel, *, manual=False):
-    """Fetch the saint of the day and send it to the given channel."""
-    result = await get_daily_saint()
-    if result is None:
+    """Fetch the saint of the day and send it to the given channel; returns False if the fetch failed."""
+    messages = await build_saint()
+    if messages is None:
         if manual:
-            await channel.send("Could not fetch saint data.")
-        return
-    if result == "no_feast":
+            await reply(channel, "Could not fetch saint data.")
+        return False
+    if not messages:
         if manual:
-            await channel.send("No saint feast today.")
+            await reply(channel, "No saint feast today.")
+        return True
+    await send_messages(channel, messages, INTERACTIVE)
+    return True
+
+
+def _owns(sub, shards):
+    """Whether this process posts to `sub`'s channel: its guild is on one of our `shards`."""
+    if sub.guild_id is None:
+        # The DISCORD_*_CHANNEL_ID settings carry no guild; the process that can see the channel posts it
+        return client.get_channel(sub.channel_id) is not None
+    return shard_for_guild(sub.guild_id, client.shard_count) in shards
+
+
+def _all_subscriptions():
+    """Every subscription this process posts; one stored for a channel overrides its environment setting."""
+    subs = dict(ENV_SUBSCRIPTIONS)
+    subs.update(subscriptions.all_subscriptions())
+    shards = set(client.shards)
+    return [sub for sub in subs.values() if _owns(sub, shards)]
+
+
+def _slot_start(now):
+    return now.replace(minute=now.minute - now.minute % SCHEDULE_SLOT, second=0, microsecond=0)
+
+
+def _due_date(sub, slot):
+    """Local date of `sub`'s daily post if it falls in the slot starting at `slot`, else None."""
+    local = slot.astimezone(sub.tzinfo)
+    if local.hour == sub.hour and local.minute < SCHEDULE_SLOT:
+        return local.date()
+    return None
+
+
+def _variant(item, sub, date):
+    return item, (sub.readings_type if item == "readings" else None), date
+
+
+async def build_daily(item, readings_type, date):
+    """Build one daily post variant as a list of send() kwargs, or None on failure."""
+    if item == "readings":
+        builder = build_latin_readings if readings_type == "latin" else build_readings
+        return await builder(date)
+    if item == "quote":
+        return await build_quote(date)
+    return await build_saint(date)
+
+
+async def _build_variant(variant):
+    start = time.perf_counter()
+    try:
+        messages = await build_daily(*variant)
+    except Exception:
+        log.exception("Failed to build daily %s", variant)
         return
-    await channel.send(embeds=result)
+    finally:
+        log.info("Daily %s built in %.2fs", variant, time.perf_counter() - start)
+    if messages is None:
+        log.warning("Could not build daily %s", variant)
+    else:
+        _prepared[variant] = messages
+
 
+async def _build_variants(variants):
+    """Build the given variants that are not prepared yet, all at once."""
+    await asyncio.gather(*(_build_variant(v) for v in variants if v not in _prepared))
 
-@tasks.loop(time=datetime.time(hour=7, minute=0, tzinfo=EST))
-async def daily_readings():
-    """Post readings and quote every day at 7:00 AM EST."""
-    channel = client.get_channel(CHANNEL_ID)
+
+async def prewarm_daily(slot=None):
+    """Build every post due within PREWARM_LEAD of `slot` (default now)."""
+    slot = _slot_start(slot or datetime.datetime.now(datetime.timezone.utc))
+    step = datetime.timedelta(minutes=SCHEDULE_SLOT)
+    variants = set()
+    for sub in _all_subscriptions():
+        for k in range(1, PREWARM_LEAD // step + 1):
+            date = _due_date(sub, slot + k * step)
+            if date is not None:
+                variants.update(_variant(item, sub, date) for item in sub.items)
+                break
+    await _build_variants(variants)
+
+
+async def _send_daily(sub, item, variant):
+    channel = client.get_channel(sub.channel_id)
     if channel is None:
-        log.error("Channel %s not found", CHANNEL_ID)
-    else:
-        log.info("Posting daily readings (type=%s)", READINGS_TYPE)
-        try:
-            if READINGS_TYPE == "latin":
-                await post_latin_readings(channel)
-            else:
-                await post_readings(channel)
-        except Exception:
-            log.exception("Failed to post daily readings")
-
-    if QUOTE_CHANNEL_ID:
-        quote_channel = client.get_channel(QUOTE_CHANNEL_ID)
-        if quote_channel is None:
-            log.error("Quote channel %s not found", QUOTE_CHANNEL_ID)
-        else:
-            log.info("Posting daily quote")
-            try:
-                await post_quote(quote_channel)
-            except Exception:
-                log.exception("Failed to post daily quote")
-
-    if SAINT_CHANNEL_ID:
-        saint_channel = client.get_channel(SAINT_CHANNEL_ID)
-        if saint_channel is None:
-            log.error("Saint channel %s not found", SAINT_CHANNEL_ID)
-        else:
-            log.info("Posting daily saint")
-            try:
-                await post_saint(saint_channel)
-            except Exception:
-                log.exception("Failed to post daily saint")
+        log.error("Channel %s for daily %s not found", sub.channel_id, item)
+        return
+    key = (sub.channel_id, item)
+    messages = _prepared.get(variant)
+    try:
+        if messages is None:
+            # Not built: leave it unposted so the next slot tries again
+            if item == "readings" and key not in _retry:
+                await outbox.send(channel, "Could not fetch today's readings.")
+            _retry[key] = variant[2]
+            return
+        await send_messages(channel, messages)
+        _posted[key] = variant[2]
+        _retry.pop(key, None)
+    except Exception:
+        log.exception("Failed to post daily %s to channel %s", item, sub.channel_id)
+
+
+async def post_daily(due):
+    """Build each distinct post once, then fan it out to every due (subscription, date)."""
+    jobs = []
+    for sub, date in due:
+        for item in sub.items:
+            if _posted.get((sub.channel_id, item)) != date:
+                jobs.append((sub, item, _variant(item, sub, date)))
+    if not jobs:
+        return
+    start = time.perf_counter()
+    variants = {variant for _sub, _item, variant in jobs}
+    await _build_variants(variants)
+    await asyncio.gather(*(_send_daily(sub, item, variant) for sub, item, variant in jobs))
+    elapsed = time.perf_counter() - start
+    HANDLER_SECONDS.observe(elapsed, handler="daily")
+    log.info("Sent %d daily posts (%d variants) in %.2fs", len(jobs), len(variants), elapsed)
+    log.info("Send queue: %s", outbox.stats())
+
+
+@tasks.loop(time=_SLOT_TIMES)
+async def daily_scheduler():
+    """Send the daily posts due in this slot, then pre-build the upcoming ones."""
+    slot = _slot_start(datetime.datetime.now(datetime.timezone.utc))
+    due = []
+    retry_dates = {channel_id: date for (channel_id, _item), date in _retry.items()}
+    for sub in _all_subscriptions():
+        date = _due_date(sub, slot)
+        if date is None:
+            date = retry_dates.get(sub.channel_id)
+            if date is not None and date != slot.astimezone(sub.tzinfo).date():
+                date = None  # that day is over
+        if date is not None:
+            due.append((sub, date))
+    # Failed posts not retried above are for days that are over or channels no longer subscribed
+    retried = {(sub.channel_id, date) for sub, date in due}
+    for key in [k for k, date in _retry.items() if (k[0], date) not in retried]:
+        del _retry[key]
+    await post_daily(due)
+    await prewarm_daily(slot)
+
+    # Drop posts built for dates that have passed everywhere
+    cutoff = slot.date() - datetime.timedelta(days=1)
+    for variant in [v for v in _prepared if v[2] < cutoff]:
+        del _prepared[variant]
+
+
+subscription_group = discord.app_commands.Group(
+    name="subscription",
+    description="Manage this server's daily posts",
+    guild_only=True,
+    default_permissions=discord.Permissions(manage_guild=True),
+)
+
+
+@subscription_group.command(name="set", description="Post daily readings, quote or saint in a channel")
+@discord.app_commands.describe(
+    channel="Channel to post in",
+    readings_type="Which Mass readings to post",
+    readings="Post the Mass readings",
+    quote="Post a saint quote",
+    saint="Post the saint of the day",
+    hour="Local hour to post at (0-23)",
+    timezone="IANA timezone name, e.g. America/Chicago",
+)
+@discord.app_commands.choices(readings_type=[
+    discord.app_commands.Choice(name="Novus Ordo (USCCB)", value="novus_ordo"),
+    discord.app_commands.Choice(name="Traditional Latin Mass", value="latin"),
+])
+async def subscription_set(
+    interaction: discord.Interaction,
+    channel: discord.TextChannel,
+    readings_type: str = "novus_ordo",
+    readings: bool = True,
+    quote: bool = False,
+    saint: bool = False,
+    hour: discord.app_commands.Range[int, 0, 23] = 7,
+    timezone: str = subscriptions.DEFAULT_TIMEZONE,
+):
+    items = tuple(item for item, wanted in (("readings", readings), ("quote", quote), ("saint", saint)) if wanted)
+    sub = Subscription(channel.id, interaction.guild_id, readings_type, items, hour, timezone)
+    try:
+        subscriptions.save(sub)
+    except ValueError as e:
+        await interaction.response.send_message(str(e), ephemeral=True)
+        return
+    log.info("Subscription set by %s: %s", interaction.user, sub)
+    await interaction.response.send_message(
+        f"{channel.mention} will get {', '.join(items)} every day at {hour:02d}:00 ({timezone}).",
+        ephemeral=True,
+    )
+
+
+@subscription_group.command(name="remove", description="Stop daily posts in a channel")
+@discord.app_commands.describe(channel="Channel to stop posting in")
+async def subscription_remove(interaction: discord.Interaction, channel: discord.TextChannel):
+    sub = subscriptions.all_subscriptions().get(channel.id)
+    if sub is None or sub.guild_id != interaction.guild_id:
+        await interaction.response.send_message(f"{channel.mention} has no daily posts.", ephemeral=True)
+        return
+    subscriptions.remove(channel.id)
+    log.info("Subscription removed by %s: %s", interaction.user, sub)
+    await interaction.response.send_message(f"Stopped daily posts in {channel.mention}.", ephemeral=True)
+
+
+@subscription_group.command(name="list", description="Show this server's daily posts")
+async def subscription_list(interaction: discord.Interaction):
+    subs = subscriptions.for_guild(interaction.guild_id)
+    if not subs:
+        await interaction.response.send_message("This server has no daily posts.", ephemeral=True)
+        return
+    lines = [
+        f"<#{sub.channel_id}> — {', '.join(sub.items)} ({sub.readings_type}) at {sub.hour:02d}:00 {sub.timezone}"
+        for sub in subs
+    ]
+    await interaction.response.send_message("\n".join(lines), ephemeral=True)
+
+
+tree.add_command(subscription_group)
+
+
+@tree.command(name="verse", description="Look up a passage in the Knox Bible")
+@discord.app_commands.describe(
+    book="Book of the Bible",
+    chapter="Chapter",
+    verse="First verse (leave out for the whole chapter)",
+    end_verse="Last verse of a range",
+)
+async def verse_command(
+    interaction: discord.Interaction,
+    book: str,
+    chapter: discord.app_commands.Range[int, 1],
+    verse: discord.app_commands.Range[int, 1] | None = None,
+    end_verse: discord.app_commands.Range[int, 1] | None = None,
+):
+    log.info("Verse lookup from %s: %s %s:%s-%s", interaction.user, book, chapter, verse, end_verse)
+    with HANDLER_SECONDS.time(handler="/verse"):
+        book_id = resolve_book(book)
+        if end_verse is not None and (verse is None or end_verse < verse):
+            end_verse = None
+        passage = render_passage(book_id, chapter, verse, end_verse) if book_id else None
+        if passage is None:
+            await interaction.response.send_message("No verses found for that reference.", ephemeral=True)
+            return
+        await interaction.response.send_message(view=format_bible_passages([passage]))
+
+
+@verse_command.autocomplete("book")
+async def verse_book_autocomplete(interaction: discord.Interaction, current: str):
+    return [
+        discord.app_commands.Choice(name=BOOK_DISPLAY.get(book_id, book_id), value=book_id)
+        for book_id in book_suggestions(current)
+    ]
+
+
+@verse_command.autocomplete("chapter")
+async def verse_chapter_autocomplete(interaction: discord.Interaction, current: str):
+    book_id = resolve_book(interaction.namespace.book or "")
+    numbers = chapter_suggestions(book_id, current) if book_id else []
+    return [discord.app_commands.Choice(name=str(n), value=n) for n in numbers]
+
+
+@verse_command.autocomplete("verse")
+@verse_command.autocomplete("end_verse")
+async def verse_number_autocomplete(interaction: discord.Interaction, current: str):
+    book_id = resolve_book(interaction.namespace.book or "")
+    chapter = interaction.namespace.chapter
+    numbers = verse_suggestions(book_id, chapter, current) if book_id and chapter else []
+    return [discord.app_commands.Choice(name=str(n), value=n) for n in numbers]
 
 
 @tree.command(name="search", description="Search the Knox Bible for a word or phrase")
 @discord.app_commands.describe(query="The word or phrase to search for")
 async def search_command(interaction: discord.Interaction, query: str):
     log.info("Bible search from %s: %s", interaction.user, query)
-    results = search_verses(query)
-    view = format_bible_search_view(query, results)
-    await interaction.response.send_message(view=view)
+    with HANDLER_SECONDS.time(handler="/search"):
+        await _search(interaction, query)
+
+
+async def _search(interaction, query):
+    key = search_key(query)
+    hits = SEARCH_CACHE.get(key)
+    if hits is not MISSING:
+        SEARCHES.inc(result="cached")
+        view = SearchResultsView(query, hits, user_id=interaction.user.id)
+        response = await interaction.response.send_message(view=view)
+        view.message = response.resource
+        return
+
+    # Not cached: acknowledge within Discord's 3s deadline, then rank in the pool
+    await interaction.response.defer(thinking=True)
+    try:
+        with SEARCH_SECONDS.time():
+            hits = await search_pool.run(rank_hits, key)
+    except PoolBusy:
+        SEARCHES.inc(result="busy")
+        await interaction.followup.send("Too many searches are running; please try again in a moment.")
+        return
+    except asyncio.TimeoutError:
+        SEARCHES.inc(result="timeout")
+        log.warning("Bible search timed out after %ss: %s", search_pool.timeout, query)
+        await interaction.followup.send("That search took too long; try more specific words.")
+        return
+    SEARCHES.inc(result="ranked")
+    SEARCH_CACHE.put(key, hits)
+    view = SearchResultsView(query, hits, user_id=interaction.user.id)
+    view.message = await interaction.followup.send(view=view, wait=True)
 
 
 @client.event
 async def on_ready():
-    log.info("Logged in as %s", client.user)
-    await tree.sync()
-    log.info("Slash commands synced")
-    if not daily_readings.is_running():
-        daily_readings.start()
+    global _ready
+    if _ready:
+        # on_ready fires again after reconnects; the commands and scheduler are already set up
+        log.info("Reconnected as %s", client.user)
+        return
+    _ready = True
+    log.info("Logged in as %s (shards %s of %d)", client.user, sorted(client.shards), client.shard_count)
+    # Commands are global; with several worker processes only the one with shard 0 syncs them
+    if 0 in client.shards:
+        try:
+            await sync_if_changed(tree, client.application_id)
+        except discord.HTTPException:
+            log.exception("Slash command sync failed; the previous commands stay registered")
+    log.info("Ready in %.1fs", time.monotonic() - _started)
+    if not daily_scheduler.is_running():
+        daily_scheduler.start()
+        # Build anything due before the first slot comes round
+        asyncio.create_task(prewarm_daily())
+
+
+def _is_owner(user):
+    app = client.application
+    if app is None:
+        return False
+    if app.team:
+        return any(member.id == user.id for member in app.team.members)
+    return app.owner is not None and app.owner.id == user.id
+
+
+async def force_sync(message):
+    """``!sync``: re-upload the slash commands even if unchanged (bot owner only)."""
+    if not _is_owner(message.author):
+        return
+    log.info("Forced slash command sync by %s", message.author)
+    try:
+        await sync_if_changed(tree, client.application_id, force=True)
+    except discord.HTTPException as e:
+        log.exception("Forced slash command sync failed")
+        await reply(message.channel, f"Slash command sync failed: {e}")
+        return
+    await reply(message.channel, "Slash commands synced.")
+
+
+async def run_command(message, command, post):
+    """Run a ! command through the cooldowns, hinting instead of re-posting when throttled."""
+    with HANDLER_SECONDS.time(handler=f"!{command}"):
+        await _run_command(message, command, post)
+
+
+async def _run_command(message, command, post):
+    channel = message.channel
+    throttled = COOLDOWNS.check(command, channel.id, message.author.id)
+    if throttled:
+        log.info("Throttled !%s from %s (%s cooldown, %.0fs left)",
+                 command, message.author, throttled.scope, throttled.retry_after)
+        if throttled.hint:
+            text = _COOLDOWN_HINTS[throttled.scope].format(command=command, seconds=max(1, round(throttled.retry_after)))
+            await reply(channel, text, delete_after=COOLDOWNS.hint_window)
+        return
+    if await post(channel) is False:
+        # Let the next request retry rather than pointing at a failure message
+        COOLDOWNS.reset(command, channel.id, message.author.id)
 
 
 @client.event
@@ -154,29 +600,71 @@ async def on_message(message):
 
     if message.content.strip() == "!readings":
         log.info("Manual readings request from %s", message.author)
-        await post_readings(message.channel)
+        await run_command(message, "readings", post_readings)
 
     if message.content.strip() == "!quote":
         log.info("Manual quote request from %s", message.author)
-        await post_quote(message.channel)
+        await run_command(message, "quote", post_quote)
 
     if message.content.strip() == "!latin":
         log.info("Manual TLM readings request from %s", message.author)
-        await post_latin_readings(message.channel)
+        await run_command(message, "latin", post_latin_readings)
 
     if message.content.strip() == "!saint":
         log.info("Manual saint request from %s", message.author)
-        await post_saint(message.channel, manual=True)
-
-    # Bible verse lookup — check if the message contains a verse reference
-    if not message.content.startswith("!"):
-        parsed = parse_verse_reference(message.content)
-        if parsed:
-            book_id, chapter, verse_start, verse_end = parsed
-            verses = lookup_verses(book_id, chapter, verse_start, verse_end)
-            if verses:
-                view = format_bible_view(book_id, chapter, verse_start, verse_end, verses)
-                await message.channel.send(view=view)
+        await run_command(message, "saint", lambda channel: post_saint(channel, manual=True))
 
+    if message.content.strip() == "!sync":
+        with HANDLER_SECONDS.time(handler="!sync"):
+            await force_sync(message)
 
-client.run(TOKEN)
+    # Bible verse lookup — reply once with every verse reference in the message
+    if not message.content.startswith("!"):
+        VERSE_PARSE_ATTEMPTS.inc()
+        # One past the limit, so the reply can say when passages were left out
+        refs = parse_all_references(message.content, MAX_PASSAGES + 1)
+        if refs:
+            VERSE_PARSE_HITS.inc()
+            with HANDLER_SECONDS.time(handler="verse_reference"):
+                passages = []
+                for ref in refs:
+                    passage = render_passage(*ref)
+                    if passage:
+                        passages.append(passage)
+                if passages:
+                    view = format_bible_passages(passages)
+                    await reply(message.channel, view=view)
+
+
+async def main():
+    # docker stop and the supervisor send SIGTERM; close cleanly so the shutdown below runs
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(client.close()))
+    async with client:
+        outbox.start()
+        search_pool.start()
+        if search_pool.kind == "process":
+            # Search processes build their own index, but result pages are rendered from
+            # this process's copy; build it now, in a thread, not on the first page
+            await asyncio.to_thread(warm_search_index)
+        metrics_runner = None
+        lag_monitor = asyncio.create_task(metrics.monitor_event_loop())
+        if METRICS_PORT:
+            metrics_runner = await metrics.start_server(METRICS_PORT, METRICS_HOST)
+        try:
+            await client.start(TOKEN)
+        finally:
+            lag_monitor.cancel()
+            if metrics_runner is not None:
+                await metrics_runner.cleanup()
+            search_pool.shutdown()
+            await outbox.stop()
+            await http_client.close()
+            flush_rotation()
+
+
+# Guarded so search worker processes can import this module without starting the bot
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,216 @@
+"""Small in-process caches shared by the bot's modules."""
+
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+
+# Returned by LRUCache.get on a miss, so that None can be cached like any other value
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=MISSING):
+        """Return the cached value for `key` (marking it recently used), or `default`."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store `value` under `key`, evicting the least recently used entries over `maxsize`."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._trim()
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+    def resize(self, maxsize):
+        """Change the size cap, evicting entries if the cache is now over it."""
+        self.maxsize = maxsize
+        self._trim()
+
+    def _trim(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class DailyCache:
+    """Per-date results of an async fetch, kept until local midnight.
+
+    `fetch` is a coroutine function taking a ``datetime.date``.  Concurrent
+    misses for the same date share one in-flight fetch, so a burst of requests
+    makes a single upstream call.  ``None`` results (fetch failures) are not
+    cached, and neither are exceptions; both go to every waiter.
+
+    There is no invalidation: the data for a past or present date does not
+    change once fetched, and ``import_liturgy.py`` fills the store from
+    another process, so entries simply expire at midnight.
+    """
+
+    def __init__(self, fetch):
+        self._fetch = fetch
+        self._values = {}
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, date=None):
+        """Return the value for `date` (default today), fetching it at most once per day."""
+        today = datetime.date.today()
+        if date is None:
+            date = today
+        self._expire(today)
+
+        if date in self._values:
+            self.hits += 1
+            return self._values[date]
+
+        task = self._inflight.get(date)
+        if task is None:
+            self.misses += 1
+            task = self._inflight[date] = asyncio.ensure_future(self._load(date))
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled waiter does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _load(self, date):
+        try:
+            value = await self._fetch(date)
+        finally:
+            self._inflight.pop(date, None)
+        if value is not None:
+            self._values[date] = value
+        return value
+
+    def _expire(self, today):
+        for date in [d for d in self._values if d < today]:
+            del self._values[date]
+
+    def stats(self):
+        return {
+            "size": len(self._values),
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
+
+
+class RenderCache:
+    """Formatted payloads keyed by (kind, date), reused while their source data is unchanged.
+
+    Each entry remembers the object it was rendered from; a lookup with a
+    different source object (the data was re-fetched or replaced) renders
+    again, so the payload is never stale.  Sources are the objects a
+    DailyCache hands out, which stay the same for a date until it refetches,
+    so the identity check stands in for explicit invalidation.
+    """
+
+    def __init__(self, maxsize=16):
+        self._entries = LRUCache(maxsize)
+        self.renders = 0
+
+    def get(self, key, source, render):
+        """Return ``render(source)`` for `key`, computing it only when `source` changed."""
+        entry = self._entries.get(key)
+        if entry is not MISSING and entry[0] is source:
+            return entry[1]
+        payload = render(source)
+        self.renders += 1
+        self._entries.put(key, (source, payload))
+        return payload
+
+    def stats(self):
+        stats = self._entries.stats()
+        stats["renders"] = self.renders
+        return stats
+
+
+class TTLCache:
+    """Entries that expire `ttl` seconds after they are stored, bounded by total weight.
+
+    `weigh` gives each value's weight (default ``len``); once the total passes
+    `max_weight` the least recently used entries are evicted.  A value heavier
+    than `max_weight` on its own is not cached.
+    """
+
+    def __init__(self, ttl, max_weight, weigh=len):
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigh = weigh
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # {key: (expires_at, weight, value)}
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=MISSING):
+        """Return the live value for `key` (marking it recently used), or `default`."""
+        entry = self._data.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key, value):
+        """Store `value` under `key`, evicting expired and then least recently used entries."""
+        self._remove(key)
+        weight = self.weigh(value)
+        if weight > self.max_weight:
+            return
+        now = time.monotonic()
+        self._data[key] = (now + self.ttl, weight, value)
+        self.weight += weight
+        if self.weight > self.max_weight:
+            for stale in [k for k, (expires, _w, _v) in self._data.items() if expires <= now]:
+                self._remove(stale)
+        while self.weight > self.max_weight:
+            self._remove(next(iter(self._data)))
+
+    def _remove(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.weight -= entry[1]
+
+    def clear(self):
+        self._data.clear()
+        self.weight = 0
+
+    def stats(self):
+        return {"size": len(self._data), "weight": self.weight, "max_weight": self.max_weight,
+                "hits": self.hits, "misses": self.misses}
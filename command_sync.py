@@ -0,0 +1,66 @@
+"""Sync the slash commands with Discord only when they have changed.
+
+``on_ready`` fires again after every reconnect, and ``tree.sync()`` is one
+of Discord's most tightly rate-limited endpoints.  The command tree is
+fingerprinted from the same payload ``sync()`` would upload (names,
+descriptions, options, permissions); the fingerprint of the last successful
+sync is saved to SYNC_STATE_PATH, and an unchanged tree is not re-uploaded.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+
+log = logging.getLogger("lucebot")
+
+SYNC_STATE_PATH = os.getenv("COMMAND_SYNC_PATH", "command_sync.json")
+
+
+def fingerprint(tree, application_id):
+    """SHA-256 of the global command payload `tree` would sync for `application_id`."""
+    payload = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda c: (c["type"], c["name"]))
+    data = json.dumps({"application_id": application_id, "commands": payload}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        log.exception("Could not read command sync state from %s; syncing", path)
+        return {}
+
+
+def _save_state(path, state):
+    directory = os.path.dirname(path)
+    tmp = f"{path}.tmp"
+    try:
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+    except OSError:
+        log.exception("Could not save command sync state to %s", path)
+
+
+async def sync_if_changed(tree, application_id, *, force=False, path=None):
+    """Sync `tree` if its fingerprint differs from the last sync (or `force`); return whether it synced."""
+    path = path or SYNC_STATE_PATH
+    current = fingerprint(tree, application_id)
+    if not force and _load_state(path).get("fingerprint") == current:
+        log.info("Slash commands unchanged since last sync (%s); not syncing", current[:12])
+        return False
+    commands = await tree.sync()
+    _save_state(path, {
+        "fingerprint": current,
+        "commands": len(commands),
+        "synced_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    })
+    log.info("Synced %d slash commands (%s)%s", len(commands), current[:12], " (forced)" if force else "")
+    return True
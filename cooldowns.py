@@ -0,0 +1,93 @@
+"""Cooldowns for the ``!`` commands.
+
+Each command has a per-channel and a per-user window.  A request inside the
+channel window is coalesced into the post that opened it (that post is
+either in flight or sitting just above), and one inside the user window is
+dropped.  Either way the caller gets a ``Throttled`` result telling it whether
+to send a short, self-deleting hint; at most one hint per channel and command
+goes out per HINT_WINDOW, so a spam burst costs one extra message at most.
+"""
+
+import time
+from typing import NamedTuple
+
+# {command: (channel_seconds, user_seconds)}
+DEFAULT_COOLDOWNS = {
+    "readings": (120, 30),
+    "latin": (120, 30),
+    "saint": (120, 30),
+    "quote": (10, 5),
+}
+HINT_WINDOW = 10
+_PRUNE_AT = 10000
+
+
+class Throttled(NamedTuple):
+    scope: str  # "channel" or "user"
+    retry_after: float
+    hint: bool
+
+
+def parse_cooldowns(spec):
+    """Parse ``"readings=120/30,quote=10/5"`` into {command: (channel_seconds, user_seconds)}."""
+    cooldowns = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        command, _, windows = item.partition("=")
+        channel, _, user = windows.partition("/")
+        try:
+            cooldowns[command.strip()] = (float(channel), float(user or 0))
+        except ValueError:
+            raise ValueError(f"Bad cooldown {item!r}; expected command=channel_seconds/user_seconds") from None
+    return cooldowns
+
+
+class Cooldowns:
+    """Per-channel and per-user cooldown windows for each command."""
+
+    def __init__(self, windows=None, hint_window=HINT_WINDOW):
+        self.windows = dict(DEFAULT_COOLDOWNS)
+        self.windows.update(windows or {})
+        self.hint_window = hint_window
+        self._until = {}  # {(scope, command, id): monotonic expiry}
+        self.allowed = 0
+        self.throttled = 0
+
+    def _remaining(self, key, now):
+        until = self._until.get(key)
+        return until - now if until is not None and until > now else 0
+
+    def _start(self, key, seconds, now):
+        if seconds > 0:
+            if len(self._until) >= _PRUNE_AT:
+                self._until = {k: t for k, t in self._until.items() if t > now}
+            self._until[key] = now + seconds
+
+    def check(self, command, channel_id, user_id):
+        """Return None and start the cooldowns if `command` may run, else a Throttled.
+
+        Throttled requests don't extend any window, so spamming can't keep a
+        channel locked out.
+        """
+        channel_seconds, user_seconds = self.windows.get(command, (0, 0))
+        now = time.monotonic()
+        for scope, key in (("channel", ("channel", command, channel_id)), ("user", ("user", command, user_id))):
+            remaining = self._remaining(key, now)
+            if remaining:
+                self.throttled += 1
+                hint_key = ("hint", command, channel_id)
+                hint = not self._remaining(hint_key, now)
+                if hint:
+                    self._start(hint_key, self.hint_window, now)
+                return Throttled(scope, remaining, hint)
+        self._start(("channel", command, channel_id), channel_seconds, now)
+        self._start(("user", command, user_id), user_seconds, now)
+        self.allowed += 1
+        return None
+
+    def reset(self, command, channel_id, user_id):
+        """End the channel and user windows early, e.g. after a failed post, so a retry can run."""
+        self._until.pop(("channel", command, channel_id), None)
+        self._until.pop(("user", command, user_id), None)
+
+    def stats(self):
+        return {"active": len(self._until), "allowed": self.allowed, "throttled": self.throttled}
@@ -0,0 +1,105 @@
+"""Pack embeds into as few messages as Discord's limits allow.
+
+Discord caps an embed description at 4096 characters, a title at 256, and the
+combined text of all embeds in one message at 6000 characters across at most
+10 embeds.  The readings formatters put each reading in one embed however long
+it is; ``pack_embeds`` groups them into messages and splits the oversized ones
+into continuation embeds that fill out the message they start in.
+"""
+
+import discord
+
+MAX_TITLE = 256
+MAX_DESCRIPTION = 4096
+MAX_MESSAGE_CHARS = 6000
+MAX_MESSAGE_EMBEDS = 10
+CONTINUED = " (cont.)"
+# Don't start an oversized embed in a message with less room than this left
+MIN_PIECE = 500
+
+
+def _split_point(text, limit):
+    """Index at which to cut `text` so the first part is at most `limit` characters.
+
+    Prefers a paragraph, then line, then word boundary in the second half of
+    the allowance, and hard-cuts only when there is none.
+    """
+    for sep in ("\n\n", "\n", " "):
+        cut = text.rfind(sep, limit // 2, limit + 1)
+        if cut > 0:
+            return cut
+    return limit
+
+
+def _title(title, suffix=""):
+    if len(title) + len(suffix) > MAX_TITLE:
+        title = title[: MAX_TITLE - len(suffix) - 3] + "..."
+    return title + suffix
+
+
+def _piece(embed, description, first, last):
+    """Copy `embed` with a new description, as the first and/or last part of a split."""
+    data = embed.to_dict()
+    data["description"] = description
+    title = data.get("title", "")
+    if first:
+        data["title"] = _title(title)
+    else:
+        data["title"] = _title(title, CONTINUED)
+        data.pop("url", None)
+    if not last:
+        data.pop("footer", None)
+    return discord.Embed.from_dict(data)
+
+
+def pack_embeds(embeds):
+    """Group embeds, in order, into the fewest messages within Discord's limits.
+
+    Returns a list of embed lists, one per message.  Embeds that fit are never
+    split, and filling each message greedily is optimal for a fixed order.  An
+    embed too long for Discord is cut into pieces sized to the room left in
+    each message; the link stays on the first piece and the footer on the last.
+    """
+    messages = []
+    current, size = [], 0
+
+    def flush():
+        nonlocal current, size
+        if current:
+            messages.append(current)
+        current, size = [], 0
+
+    def add(embed, length):
+        nonlocal size
+        if current and (len(current) == MAX_MESSAGE_EMBEDS or size + length > MAX_MESSAGE_CHARS):
+            flush()
+        current.append(embed)
+        size += length
+
+    for embed in embeds:
+        length = len(embed)
+        text = embed.description or ""
+        if len(text) <= MAX_DESCRIPTION and len(embed.title or "") <= MAX_TITLE and length <= MAX_MESSAGE_CHARS:
+            add(embed, length)
+            continue
+
+        first = True
+        while text:
+            if len(current) == MAX_MESSAGE_EMBEDS:
+                flush()
+            room = MAX_MESSAGE_CHARS - size
+            piece = _piece(embed, text, first, last=True)
+            if len(text) <= MAX_DESCRIPTION and len(piece) <= room:
+                add(piece, len(piece))
+                break
+            limit = min(MAX_DESCRIPTION, room - len(_piece(embed, "", first, last=False)))
+            if limit < MIN_PIECE and current:
+                flush()
+                continue
+            cut = _split_point(text, limit)
+            piece = _piece(embed, text[:cut].rstrip(), first, last=False)
+            add(piece, len(piece))
+            text = text[cut:].lstrip()
+            first = False
+    flush()
+    return messages
@@ -0,0 +1,76 @@
+"""Shared HTTP client for upstream JSON fetches (Missale Meum, the saint calendar).
+
+One pooled ``aiohttp.ClientSession`` serves the whole bot, so repeat calls reuse
+keep-alive connections and cached DNS instead of paying a handshake each time.
+The bot closes it on shutdown with ``close()``.
+"""
+
+import asyncio
+import logging
+import random
+
+import aiohttp
+
+log = logging.getLogger("lucebot")
+
+TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+RETRIES = 3
+BACKOFF_BASE = 0.5  # seconds; doubles each attempt
+BACKOFF_MAX = 8.0
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+
+_session = None
+
+
+def get_session():
+    """Return the shared session, creating it on first use inside the running event loop."""
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        _session = aiohttp.ClientSession(connector=connector, timeout=TIMEOUT)
+    return _session
+
+
+async def close():
+    """Close the shared session (a later call to get_session opens a new one)."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff delay for the given (0-based) attempt."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+async def get_json(url, *, retries=RETRIES):
+    """GET `url` and decode its JSON body.
+
+    Timeouts, connection errors and 5xx responses are retried with jittered
+    exponential backoff.  Returns ``(status, data)`` where ``data`` is ``None``
+    unless the status is 200; raises the last error once retries run out.
+    """
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url) as resp:
+                if resp.status >= 500 and attempt < retries:
+                    log.warning("GET %s returned %s; retrying", url, resp.status)
+                elif resp.status != 200:
+                    return resp.status, None
+                else:
+                    return resp.status, await resp.json()
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            if attempt >= retries:
+                raise
+            log.warning("GET %s failed (%s); retrying", url, type(e).__name__)
+        await asyncio.sleep(_backoff(attempt))
@@ -0,0 +1,91 @@
+"""Bulk-import liturgical data into the local store (see liturgy_store.py).
+
+Pulls a whole year of saint calendar entries and a window of TLM propers (and,
+optionally, USCCB readings) in one batch so the daily posts never have to wait
+on the network:
+
+    python import_liturgy.py [--year 2026] [--start 2026-01-01] [--days 60] [--readings]
+"""
+
+import argparse
+import asyncio
+import datetime
+import logging
+
+import http_client
+import liturgy_store
+from latin_readings import fetch_latin_data
+from readings import fetch_mass
+from saints import fetch_saint_data
+
+log = logging.getLogger("lucebot")
+
+
+def _date_range(start, days):
+    return [start + datetime.timedelta(days=i) for i in range(days)]
+
+
+async def _fetch_all(kind, dates, fetch, to_data, concurrency, refresh):
+    """Fetch and store every date not already stored; return (stored, failed) counts."""
+    if not refresh and dates:
+        have = liturgy_store.stored_dates(kind, dates[0], dates[-1])
+        dates = [d for d in dates if d not in have]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(date):
+        async with semaphore:
+            try:
+                result = await fetch(date)
+            except Exception:
+                log.exception("Failed to fetch %s for %s", kind, date)
+                return False
+        if result is None:
+            return False
+        liturgy_store.save(kind, date, to_data(result))
+        return True
+
+    results = await asyncio.gather(*(fetch_one(d) for d in dates))
+    stored = sum(results)
+    return stored, len(results) - stored
+
+
+async def run(args):
+    year_start = datetime.date(args.year, 1, 1)
+    year_days = (datetime.date(args.year + 1, 1, 1) - year_start).days
+    window = _date_range(args.start, args.days)
+
+    jobs = [
+        ("saint", _date_range(year_start, year_days), fetch_saint_data, lambda data: data),
+        ("latin", window, fetch_latin_data, lambda data: data),
+    ]
+    if args.readings:
+        jobs.append(("novus_ordo", window, fetch_mass, lambda mass: mass.to_dict()))
+
+    try:
+        for kind, dates, fetch, to_data in jobs:
+            stored, failed = await _fetch_all(kind, dates, fetch, to_data, args.concurrency, args.refresh)
+            log.info("Imported %s: %d stored, %d failed", kind, stored, failed)
+    finally:
+        await http_client.close()
+        liturgy_store.close()
+
+
+def main():
+    today = datetime.date.today()
+    parser = argparse.ArgumentParser(description="Bulk-import liturgical data into the local store.")
+    parser.add_argument("--year", type=int, default=today.year, help="year of saint calendar entries to import")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=today,
+                        help="first date of the propers window (YYYY-MM-DD, default today)")
+    parser.add_argument("--days", type=int, default=60, help="length of the propers window in days")
+    parser.add_argument("--readings", action="store_true",
+                        help="also scrape USCCB Novus Ordo readings for the window")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel requests per source")
+    parser.add_argument("--refresh", action="store_true", help="re-fetch dates that are already stored")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
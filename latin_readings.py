@@ -1,9 +1,13 @@
 import datetime
 import logging
 
-import aiohttp
 import discord
 
+import http_client
+import liturgy_store
+from cache import DailyCache
+from metrics import FETCH_ERRORS, FETCH_SECONDS
+
 log = logging.getLogger("lucebot")
 
 API_URL = "https://www.missalemeum.com/en/api/v5/proper"
@@ -34,24 +38,46 @@ COLOR_MAP = {
 }
 
 
-async def get_latin_readings():
-    """Fetch today's TLM propers from the Missale Meum API."""
-    today = datetime.date.today().isoformat()
-    url = f"{API_URL}/{today}"
+async def fetch_latin_data(date):
+    """Fetch the TLM propers for `date` from the Missale Meum API, or None on errors."""
+    url = f"{API_URL}/{date.isoformat()}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status != 200:
-                    log.error("Missale Meum API returned %s", resp.status)
-                    return None
-                return await resp.json()
+        with FETCH_SECONDS.time(source="missalemeum"):
+            status, data = await http_client.get_json(url)
+        if status != 200:
+            log.error("Missale Meum API returned %s", status)
+            FETCH_ERRORS.inc(source="missalemeum")
+            return None
+        return data
     except Exception:
         log.exception("Failed to fetch TLM propers")
+        FETCH_ERRORS.inc(source="missalemeum")
         return None
 
 
+async def _load_latin_readings(date):
+    data = liturgy_store.load("latin", date)
+    if data is None:
+        data = await fetch_latin_data(date)
+        if data is None:
+            return None
+        liturgy_store.save("latin", date, data)
+    return data
+
+
+_latin_cache = DailyCache(_load_latin_readings)
+
+
+async def get_latin_readings(date=None):
+    """Get the TLM propers for `date` (default today), from the store or the Missale Meum API."""
+    return await _latin_cache.get(date)
+
+
 def format_latin_for_discord(data):
-    """Convert Missale Meum API response into a list of Discord Embeds."""
+    """Convert Missale Meum API response into a list of Discord Embeds.
+
+    Long sections are not truncated; group the embeds with ``embeds.pack_embeds``.
+    """
     # API returns a list of propers; use the first one
     if isinstance(data, list):
         data = data[0]
@@ -103,9 +129,6 @@ def format_latin_for_discord(data):
         if not text:
             continue
 
-        if len(text) > 4096:
-            text = text[:4093] + "..."
-
         embed = discord.Embed(
             title=label,
             description=text,
@@ -0,0 +1,246 @@
+"""Novus Ordo readings from the local calendar and the Knox Bible.
+
+``lectionary.json`` maps a liturgical day's key (see liturgical_calendar.py)
+to its readings for each Sunday cycle, as lectionary citations:
+
+    {"lent-3-sunday": {"A": [["Reading 1", "Ex 17:3-7"], ...], "B": [...], "C": [...]},
+     "palm-sunday": {"all": [...], "A": [["Gospel", "Mt 26:14-27:66"]], ...}}
+
+``"all"`` holds the readings shared by every cycle; the cycle's own list is
+appended to it.  Citations use the lectionary's book abbreviations and its
+(Hebrew) psalm and verse numbering; they are mapped onto the Knox Bible's
+Vulgate numbering before the text is looked up.
+
+The table covers the Sundays of Advent, Lent and Easter, the Christmas
+season, the Triduum and the major solemnities and feasts.  It has no
+Ordinary Time Sundays and no weekdays: those days return None and the
+caller falls back to the USCCB readings.
+"""
+
+import datetime
+import json
+import logging
+import os
+import re
+from typing import NamedTuple
+
+from bible import BIBLE, lookup_verses
+from liturgical_calendar import liturgical_day
+
+log = logging.getLogger("lucebot")
+
+LECTIONARY_PATH = os.path.join(os.path.dirname(__file__), "lectionary.json")
+READINGS_URL = "https://bible.usccb.org/bible/readings/{:%m%d%y}.cfm"
+
+# Lectionary (NABRE) abbreviations to knox.json book ids
+LECTIONARY_BOOKS = {
+    "Gn": "Gen", "Ex": "Ex", "Lv": "Lev", "Nm": "Num", "Dt": "Dt", "Jos": "Jos", "Jgs": "Judg",
+    "Ru": "Ru", "1 Sm": "1_Kgs", "2 Sm": "2_Kgs", "1 Kgs": "3_Kgs", "2 Kgs": "4_Kgs",
+    "1 Chr": "1_Par", "2 Chr": "2_Par", "Ezr": "Esd", "Neh": "Neh", "Tb": "Tob", "Jdt": "Jdt",
+    "Est": "Est", "1 Mc": "1_Mac", "2 Mc": "2_Mac", "Jb": "Job", "Ps": "Ps", "Prv": "Prov",
+    "Eccl": "Eccl", "Sg": "Cant", "Wis": "Wis", "Sir": "Eccle", "Is": "Isa", "Jer": "Jer",
+    "Lam": "Lam", "Bar": "Bar", "Ez": "Eze", "Dn": "Dan", "Hos": "Os", "Jl": "Jo", "Am": "Am",
+    "Ob": "Abd", "Jon": "Jon", "Mi": "Mic", "Na": "Nah", "Hb": "Hab", "Zep": "Sop", "Hg": "Agg",
+    "Zec": "Zac", "Mal": "Mal",
+    "Mt": "Mat", "Mk": "Mk", "Lk": "Lk", "Jn": "Jn", "Acts": "Act", "Rom": "Rom",
+    "1 Cor": "1_Cor", "2 Cor": "2_Cor", "Gal": "Gal", "Eph": "Eph", "Phil": "Phl", "Col": "Col",
+    "1 Thes": "1_Th", "2 Thes": "2_Th", "1 Tm": "1_Tim", "2 Tm": "2_Tim", "Ti": "Tit",
+    "Phlm": "Phm", "Heb": "Heb", "Jas": "Jas", "1 Pt": "1_Pet", "2 Pt": "2_Pet",
+    "1 Jn": "1_Jn", "2 Jn": "2_Jn", "3 Jn": "3_Jn", "Jude": "Jud", "Rv": "Apoc",
+}
+
+# Chapters numbered differently in the Vulgate outside the Psalms:
+# {(book_id, chapter): [(first_verse, last_verse, vulgate_chapter, verse_offset), ...]}
+# Sirach 3 gains the Vulgate's extra verses 1 and 10 (and has no Hebrew verse 19).
+_CHAPTER_SHIFTS = {
+    ("Jo", 3): [(1, 5, 2, 27)],
+    ("Jo", 4): [(1, 21, 3, 0)],
+    ("Mal", 3): [(19, 24, 4, -18)],
+    ("Mic", 4): [(14, 14, 5, -13)],
+    ("Mic", 5): [(1, 14, 5, 1)],
+    ("Isa", 63): [(19, 19, 64, -18)],
+    ("Eccle", 3): [(1, 8, 3, 1), (9, 18, 3, 2), (20, 21, 3, 1)],
+    ("Isa", 64): [(1, 11, 64, 1)],
+}
+
+_SECTION_FOOTERS = {
+    "Gospel": "\nThe Gospel of the Lord.\nPraise to you, Lord Jesus Christ.",
+    "Reading 1": "\nThe word of the Lord.\nThanks be to God.",
+    "Reading 2": "\nThe word of the Lord.\nThanks be to God.",
+}
+_CITATION_PATTERN = re.compile(r"^((?:[1-3] )?[A-Z][a-z]+)\s+(.+)$")
+
+
+class LocalReading(NamedTuple):
+    header: str
+    text: str
+    verses: tuple = ()
+
+
+class LocalSection(NamedTuple):
+    display_header: str
+    footer: str
+    readings: list
+
+
+class LocalMass(NamedTuple):
+    """A Mass rendered from the local lectionary; formats like the USCCB ``models.Mass``."""
+
+    date: datetime.date
+    title: str
+    url: str
+    sections: list
+
+    @property
+    def date_str(self):
+        return self.date.strftime("%B %d, %Y")
+
+
+def _load_lectionary(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        log.warning("No lectionary table at %s; Novus Ordo readings come from USCCB only", path)
+        return {}
+
+
+LECTIONARY = _load_lectionary(LECTIONARY_PATH)
+
+
+def _psalm(chapter, verse):
+    """Map a Hebrew-numbered psalm verse to the Vulgate numbering the Knox Bible follows."""
+    if chapter <= 8 or chapter >= 148:
+        return chapter, verse
+    if chapter == 9:
+        return 9, verse
+    if chapter == 10:
+        return 9, verse + 21
+    if chapter <= 113:
+        return chapter - 1, verse
+    if chapter == 114:
+        return 113, verse
+    if chapter == 115:
+        return 113, verse + 8
+    if chapter == 116:
+        return (114, verse) if verse <= 9 else (115, verse - 9)
+    if chapter <= 146:
+        return chapter - 1, verse
+    return (146, verse) if verse <= 11 else (147, verse - 11)
+
+
+def _vulgate(book_id, chapter, verse):
+    if book_id == "Ps":
+        return _psalm(chapter, verse)
+    for first, last, new_chapter, offset in _CHAPTER_SHIFTS.get((book_id, chapter), ()):
+        if first <= verse <= last:
+            return new_chapter, verse + offset
+    return chapter, verse
+
+
+def _verse_number(text):
+    """``"16b"`` -> 16: the lectionary's part-verse letters are read as the whole verse."""
+    return int(text.rstrip("abcdefg"))
+
+
+def parse_citation(citation):
+    """Parse ``"Is 63:16b-17, 19b; 64:2-7"`` into (book_id, [[(chapter, verse), ...], ...]).
+
+    Each inner list is one contiguous run of verses, in lectionary numbering.
+    Returns None for a book or format it doesn't know.
+    """
+    m = _CITATION_PATTERN.match(citation.replace("–", "-").replace("—", "-").strip())
+    book_id = m and LECTIONARY_BOOKS.get(m.group(1))
+    if book_id is None:
+        return None
+    runs = []
+    chapter = None
+    try:
+        for group in m.group(2).split(";"):
+            for item in group.split(","):
+                start, _, end = item.strip().partition("-")
+                if ":" in start:
+                    chapter_text, _, start = start.partition(":")
+                    chapter = int(chapter_text)
+                if chapter is None:
+                    return None
+                first = _verse_number(start)
+                if not end:
+                    runs.append([(chapter, first)])
+                    continue
+                end_chapter = chapter
+                if ":" in end:
+                    end_chapter_text, _, end = end.partition(":")
+                    end_chapter = int(end_chapter_text)
+                last = _verse_number(end)
+                run = []
+                for ch in range(chapter, end_chapter + 1):
+                    lo = first if ch == chapter else 1
+                    hi = last if ch == end_chapter else (BIBLE.max_verse(book_id, ch) or lo)
+                    run.extend((ch, v) for v in range(lo, hi + 1))
+                runs.append(run)
+                chapter = end_chapter
+    except ValueError:
+        return None
+    return book_id, runs
+
+
+def _merge_runs(runs):
+    """Join runs that continue one another, as in ``"Ps 67:2-3, 5, 6, 8"``."""
+    merged = []
+    for run in runs:
+        if merged and merged[-1][-1][0] == run[0][0] and merged[-1][-1][1] + 1 == run[0][1]:
+            merged[-1].extend(run)
+        else:
+            merged.append(list(run))
+    return merged
+
+
+def render_citation(citation, psalm=False):
+    """Return the Knox text of a lectionary citation, or None if any part of it is missing.
+
+    Psalm verses go one per line; prose verses run on.  Gaps in the citation
+    become paragraph breaks.
+    """
+    parsed = parse_citation(citation)
+    if parsed is None:
+        return None
+    book_id, runs = parsed
+    paragraphs = []
+    for run in _merge_runs(runs):
+        # Look each run up a Vulgate chapter at a time
+        spans = []
+        for chapter, verse in (_vulgate(book_id, ch, v) for ch, v in run):
+            if spans and spans[-1][0] == chapter and spans[-1][2] + 1 == verse:
+                spans[-1][2] = verse
+            else:
+                spans.append([chapter, verse, verse])
+        texts = []
+        for chapter, first, last in spans:
+            verses = lookup_verses(book_id, chapter, first, last)
+            if verses is None or len(verses) != last - first + 1:
+                return None
+            texts.extend(text for _, text in verses)
+        paragraphs.append(("\n" if psalm else " ").join(texts))
+    return "\n\n".join(paragraphs)
+
+
+def local_mass(date):
+    """Build the Mass readings for `date` from the lectionary table, or None if it can't.
+
+    None means the day isn't in the table or one of its passages isn't in the
+    local Bible; either way the caller should fall back to another source.
+    """
+    day = liturgical_day(date)
+    entry = LECTIONARY.get(day.key)
+    if entry is None:
+        return None
+    cycle = entry.get(day.sunday_cycle, [])
+    sections = []
+    for header, citation in entry.get("all", []) + cycle:
+        text = render_citation(citation, psalm=header == "Responsorial Psalm")
+        if text is None:
+            log.warning("Lectionary citation %r for %s is not in the local Bible", citation, day.key)
+            return None
+        sections.append(LocalSection(header, _SECTION_FOOTERS.get(header, ""), [LocalReading(citation, text)]))
+    return LocalMass(date, day.name, READINGS_URL.format(date), sections)
@@ -0,0 +1,269 @@
+"""The General Roman Calendar (as observed in the United States), computed locally.
+
+``liturgical_day(date)`` works out the celebration for any date: the season
+and week from the date of Easter and the First Sunday of Advent, the Sunday
+(A/B/C) lectionary cycle, and the fixed-date solemnities
+and feasts, resolved by the Table of Liturgical Days.  Solemnities that are
+impeded are transferred; impeded feasts are dropped for the year.
+
+Memorials are not modelled: they rarely have proper readings, and the
+lectionary uses the weekday readings on them.
+"""
+
+import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+ONE_DAY = datetime.timedelta(days=1)
+ONE_WEEK = datetime.timedelta(days=7)
+SUNDAY = 6
+
+# Most US provinces keep the Ascension on the following Sunday (the Seventh Sunday of Easter)
+ASCENSION_ON_SUNDAY = True
+
+# Ranks from the Table of Liturgical Days; a lower number takes precedence
+RANK_TRIDUUM = 1
+RANK_PRINCIPAL = 2  # Christmas, Epiphany, Ascension, Pentecost, Sundays of Advent, Lent and Easter, ...
+RANK_SOLEMNITY = 3
+RANK_FEAST_OF_THE_LORD = 5
+RANK_SUNDAY = 6  # Sundays of the Christmas season and Ordinary Time
+RANK_FEAST = 7
+RANK_PRIVILEGED_WEEKDAY = 9  # Advent weekdays from December 17, Lent weekdays
+RANK_WEEKDAY = 13
+
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_ORDINALS = (
+    "", "First", "Second", "Third", "Fourth", "Fifth", "Sixth", "Seventh", "Eighth", "Ninth", "Tenth",
+    "Eleventh", "Twelfth", "Thirteenth", "Fourteenth", "Fifteenth", "Sixteenth", "Seventeenth",
+    "Eighteenth", "Nineteenth", "Twentieth", "Twenty-first", "Twenty-second", "Twenty-third",
+    "Twenty-fourth", "Twenty-fifth", "Twenty-sixth", "Twenty-seventh", "Twenty-eighth",
+    "Twenty-ninth", "Thirtieth", "Thirty-first", "Thirty-second", "Thirty-third", "Thirty-fourth",
+)
+_SEASON_NAMES = {"advent": "Advent", "lent": "Lent", "easter": "Easter", "ordinary": "Ordinary Time"}
+
+
+class LiturgicalDay(NamedTuple):
+    date: datetime.date
+    key: str  # lectionary key, e.g. "easter", "lent-3-sunday", "ordinary-5-monday"
+    name: str
+    season: str  # advent, christmas, lent, triduum, easter or ordinary
+    week: int | None
+    rank: int
+    sunday_cycle: str  # "A", "B" or "C"
+
+
+# (month, day): (key, name, rank)
+FIXED_CELEBRATIONS = {
+    (2, 2): ("presentation", "The Presentation of the Lord", RANK_FEAST_OF_THE_LORD),
+    (3, 19): ("joseph", "Saint Joseph, Spouse of the Blessed Virgin Mary", RANK_SOLEMNITY),
+    (3, 25): ("annunciation", "The Annunciation of the Lord", RANK_SOLEMNITY),
+    (6, 24): ("john-the-baptist", "The Nativity of Saint John the Baptist", RANK_SOLEMNITY),
+    (6, 29): ("peter-and-paul", "Saints Peter and Paul, Apostles", RANK_SOLEMNITY),
+    (8, 6): ("transfiguration", "The Transfiguration of the Lord", RANK_FEAST_OF_THE_LORD),
+    (8, 15): ("assumption", "The Assumption of the Blessed Virgin Mary", RANK_SOLEMNITY),
+    (9, 14): ("holy-cross", "The Exaltation of the Holy Cross", RANK_FEAST_OF_THE_LORD),
+    (11, 1): ("all-saints", "All Saints", RANK_SOLEMNITY),
+    (11, 2): ("all-souls", "The Commemoration of All the Faithful Departed (All Souls' Day)", RANK_SOLEMNITY),
+    (11, 9): ("lateran", "The Dedication of the Lateran Basilica", RANK_FEAST_OF_THE_LORD),
+    (12, 8): ("immaculate-conception", "The Immaculate Conception of the Blessed Virgin Mary", RANK_SOLEMNITY),
+    (12, 26): ("stephen", "Saint Stephen, the First Martyr", RANK_FEAST),
+    (12, 27): ("john-apostle", "Saint John, Apostle and Evangelist", RANK_FEAST),
+    (12, 28): ("holy-innocents", "The Holy Innocents, Martyrs", RANK_FEAST),
+}
+
+
+def easter(year):
+    """Date of Easter Sunday in the Gregorian calendar (the anonymous Gregorian computus)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _sunday_on_or_before(date):
+    return date - datetime.timedelta(days=(date.weekday() + 1) % 7)
+
+
+def advent_start(year):
+    """First Sunday of Advent: the fourth Sunday before Christmas."""
+    christmas = datetime.date(year, 12, 25)
+    return _sunday_on_or_before(christmas - ONE_DAY) - 3 * ONE_WEEK
+
+
+def epiphany(year):
+    """The Epiphany, kept in the US on the Sunday between January 2 and 8."""
+    jan2 = datetime.date(year, 1, 2)
+    return jan2 + datetime.timedelta(days=(SUNDAY - jan2.weekday()) % 7)
+
+
+def baptism_of_the_lord(year):
+    """The Sunday after Epiphany, or the Monday when Epiphany falls on January 7 or 8."""
+    day = epiphany(year)
+    return day + (ONE_DAY if day.day >= 7 else ONE_WEEK)
+
+
+def holy_family(year):
+    """The Sunday within the Octave of Christmas, or December 30 when there is none."""
+    for day in range(26, 32):
+        date = datetime.date(year, 12, day)
+        if date.weekday() == SUNDAY:
+            return date
+    return datetime.date(year, 12, 30)
+
+
+def sunday_cycle(date):
+    """The Sunday lectionary cycle ("A", "B" or "C") of the liturgical year containing `date`."""
+    year = date.year + 1 if date >= advent_start(date.year) else date.year
+    return "ABC"[(year - 1) % 3]
+
+
+def _weekday_name(date):
+    return _WEEKDAYS[date.weekday()].capitalize()
+
+
+def _seasonal_day(date, season, week, rank=None):
+    """A Sunday or weekday of a season, named and keyed by its week."""
+    weekday = _WEEKDAYS[date.weekday()]
+    season_name = _SEASON_NAMES[season]
+    if weekday == "sunday":
+        name = f"{_ORDINALS[week]} Sunday {'in' if season == 'ordinary' else 'of'} {season_name}"
+        default_rank = RANK_SUNDAY if season == "ordinary" else RANK_PRINCIPAL
+    else:
+        name = f"{weekday.capitalize()} of the {_ORDINALS[week]} Week {'in' if season == 'ordinary' else 'of'} {season_name}"
+        default_rank = RANK_PRIVILEGED_WEEKDAY if season == "lent" else RANK_WEEKDAY
+    return f"{season}-{week}-{weekday}", name, season, week, rank or default_rank
+
+
+def _temporal(date):
+    """(key, name, season, week, rank) of the Proper of Time for `date`."""
+    year = date.year
+    easter_day = easter(year)
+    delta = (date - easter_day).days
+    advent = advent_start(year)
+
+    # Christmas season, in the old civil year
+    if date >= datetime.date(year, 12, 25):
+        if date.day == 25:
+            return "christmas", "The Nativity of the Lord (Christmas)", "christmas", None, RANK_PRINCIPAL
+        if date == holy_family(year):
+            return "holy-family", "The Holy Family of Jesus, Mary and Joseph", "christmas", None, RANK_FEAST_OF_THE_LORD
+        return (f"christmas-dec-{date.day}", f"{_ORDINALS[date.day - 24]} Day within the Octave of the Nativity of the Lord",
+                "christmas", None, RANK_PRIVILEGED_WEEKDAY)
+    if date >= advent:
+        week = (date - advent).days // 7 + 1
+        if date.weekday() != SUNDAY and date.day >= 17 and date.month == 12:
+            return f"advent-dec-{date.day}", f"{_weekday_name(date)} of Advent, December {date.day}", "advent", week, RANK_PRIVILEGED_WEEKDAY
+        return _seasonal_day(date, "advent", week)
+
+    # Christmas season, in the new civil year
+    baptism = baptism_of_the_lord(year)
+    if date <= baptism:
+        if date.month == 1 and date.day == 1:
+            return "mary-mother-of-god", "Mary, the Holy Mother of God", "christmas", None, RANK_SOLEMNITY
+        epiphany_day = epiphany(year)
+        if date == epiphany_day:
+            return "epiphany", "The Epiphany of the Lord", "christmas", None, RANK_PRINCIPAL
+        if date == baptism:
+            return "baptism-of-the-lord", "The Baptism of the Lord", "christmas", None, RANK_FEAST_OF_THE_LORD
+        if date < epiphany_day:
+            return f"christmas-jan-{date.day}", f"{_weekday_name(date)} of Christmas Time, January {date.day}", "christmas", None, RANK_WEEKDAY
+        return (f"epiphany-{_WEEKDAYS[date.weekday()]}", f"{_weekday_name(date)} after Epiphany",
+                "christmas", None, RANK_WEEKDAY)
+
+    # Ordinary Time before Lent: week 1 starts the day after the Baptism of the Lord
+    if delta < -46:
+        week = (date - _sunday_on_or_before(baptism)).days // 7 + 1
+        return _seasonal_day(date, "ordinary", week)
+
+    # Lent and Holy Week
+    if delta == -46:
+        return "ash-wednesday", "Ash Wednesday", "lent", 0, RANK_PRINCIPAL
+    if delta < -42:
+        return (f"lent-0-{_WEEKDAYS[date.weekday()]}", f"{_weekday_name(date)} after Ash Wednesday",
+                "lent", 0, RANK_PRIVILEGED_WEEKDAY)
+    if delta == -7:
+        return "palm-sunday", "Palm Sunday of the Passion of the Lord", "lent", 6, RANK_PRINCIPAL
+    if -7 < delta < -3:
+        return f"holy-{_WEEKDAYS[date.weekday()]}", f"{_weekday_name(date)} of Holy Week", "lent", 6, RANK_PRINCIPAL
+    if delta == -3:
+        return "holy-thursday", "Holy Thursday (Evening Mass of the Lord's Supper)", "triduum", None, RANK_TRIDUUM
+    if delta == -2:
+        return "good-friday", "Friday of the Passion of the Lord (Good Friday)", "triduum", None, RANK_TRIDUUM
+    if delta == -1:
+        return "holy-saturday", "Holy Saturday (The Easter Vigil in the Holy Night)", "triduum", None, RANK_TRIDUUM
+    if delta < 0:
+        return _seasonal_day(date, "lent", (delta + 42) // 7 + 1)
+
+    # Easter season
+    if delta == 0:
+        return "easter", "Easter Sunday of the Resurrection of the Lord", "easter", 1, RANK_TRIDUUM
+    if delta < 7:
+        return (f"easter-1-{_WEEKDAYS[date.weekday()]}", f"{_weekday_name(date)} within the Octave of Easter",
+                "easter", 1, RANK_PRINCIPAL)
+    if delta == (42 if ASCENSION_ON_SUNDAY else 39):
+        return "ascension", "The Ascension of the Lord", "easter", 7 if ASCENSION_ON_SUNDAY else 6, RANK_PRINCIPAL
+    if delta == 49:
+        return "pentecost", "Pentecost Sunday", "easter", None, RANK_PRINCIPAL
+    if delta < 49:
+        day = _seasonal_day(date, "easter", delta // 7 + 1)
+        if delta == 7:
+            return (day[0], "Second Sunday of Easter (or of Divine Mercy)") + day[2:]
+        return day
+
+    # Ordinary Time after Pentecost, numbered back from Christ the King in week 34
+    christ_the_king = advent - ONE_WEEK
+    if date == christ_the_king:
+        return ("christ-the-king", "Our Lord Jesus Christ, King of the Universe", "ordinary", 34, RANK_SOLEMNITY)
+    if delta == 56:
+        return "trinity", "The Most Holy Trinity", "ordinary", None, RANK_SOLEMNITY
+    if delta == 63:
+        return "corpus-christi", "The Most Holy Body and Blood of Christ", "ordinary", None, RANK_SOLEMNITY
+    if delta == 68:
+        return "sacred-heart", "The Most Sacred Heart of Jesus", "ordinary", None, RANK_SOLEMNITY
+    week = 34 - (christ_the_king - _sunday_on_or_before(date)).days // 7
+    return _seasonal_day(date, "ordinary", week)
+
+
+def _transfer_date(key, date, taken):
+    """Where an impeded solemnity goes: the special US rules, else the next free day."""
+    year = date.year
+    easter_day = easter(year)
+    if key == "joseph" and easter_day - ONE_WEEK <= date <= easter_day:
+        # In Holy Week: the Saturday before Palm Sunday
+        return easter_day - ONE_WEEK - ONE_DAY
+    if key == "annunciation" and easter_day - ONE_WEEK <= date <= easter_day + ONE_WEEK:
+        # In Holy Week or the Easter Octave: the Monday after the Second Sunday of Easter
+        return easter_day + ONE_WEEK + ONE_DAY
+    candidate = date + ONE_DAY
+    while _temporal(candidate)[4] <= RANK_SOLEMNITY or candidate in taken:
+        candidate += ONE_DAY
+    return candidate
+
+
+@lru_cache(maxsize=8)
+def _sanctoral(year):
+    """{date: (key, name, rank)} of the fixed celebrations kept in `year`, after transfers."""
+    taken = {}
+    for (month, day), (key, name, rank) in sorted(FIXED_CELEBRATIONS.items()):
+        date = datetime.date(year, month, day)
+        if rank < _temporal(date)[4]:
+            taken[date] = (key, name, rank)
+        elif rank <= RANK_SOLEMNITY:
+            taken[_transfer_date(key, date, taken)] = (key, name, rank)
+    return taken
+
+
+def liturgical_day(date):
+    """The LiturgicalDay celebrated on `date`."""
+    key, name, season, week, rank = _temporal(date)
+    celebration = _sanctoral(date.year).get(date)
+    if celebration is not None and celebration[2] < rank:
+        key, name, rank = celebration
+    return LiturgicalDay(date, key, name, season, week, rank, sunday_cycle(date))
@@ -0,0 +1,75 @@
+"""Persistent SQLite store for fetched liturgical data.
+
+Saint calendar entries, TLM propers and Novus Ordo readings are fixed for a
+given date, so each is kept as JSON under (kind, date) once fetched.  The
+fetchers read here first, which keeps the network off the daily hot path and
+lets the bot keep posting through upstream outages.  ``import_liturgy.py``
+fills the store in bulk.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+
+STORE_PATH = os.getenv("LITURGY_DB_PATH", "liturgy.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    kind TEXT NOT NULL,
+    date TEXT NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (kind, date)
+)
+"""
+
+_conn = None
+
+
+def _connection():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(STORE_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(_SCHEMA)
+        _conn.commit()
+    return _conn
+
+
+def load(kind, date):
+    """Return the stored data for (kind, date), or None if nothing is stored."""
+    row = _connection().execute(
+        "SELECT data FROM entries WHERE kind = ? AND date = ?", (kind, date.isoformat())
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def save(kind, date, data):
+    """Store (or replace) the data for (kind, date)."""
+    conn = _connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO entries (kind, date, data, fetched_at) VALUES (?, ?, ?, ?)",
+        (kind, date.isoformat(), json.dumps(data),
+         datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")),
+    )
+    conn.commit()
+
+
+def stored_dates(kind, start, end):
+    """Return the set of dates in [start, end] that already have data of this kind."""
+    rows = _connection().execute(
+        "SELECT date FROM entries WHERE kind = ? AND date BETWEEN ? AND ?",
+        (kind, start.isoformat(), end.isoformat()),
+    )
+    return {datetime.date.fromisoformat(row[0]) for row in rows}
+
+
+def close():
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
@@ -0,0 +1,203 @@
+"""Prometheus metrics for the bot, served as text on a local HTTP port.
+
+Modules record into the counters and histograms defined at the bottom of
+this file; ``start_server`` serves them all at ``/metrics`` in the Prometheus
+text format, and ``monitor_event_loop`` samples how late the event loop runs
+its callbacks.  Recording is a few dict operations, so it stays on even when
+nothing is scraping.  Discord's 429s are counted from discord.py's own
+warnings, since its HTTP client retries them internally.
+"""
+
+import asyncio
+import logging
+import time
+
+from aiohttp import web
+
+log = logging.getLogger("lucebot")
+
+# Seconds; spans a cache hit to a slow upstream
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LAG_INTERVAL = 0.5
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for key, value in sorted(self._values.items()):
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    """A count that only goes up; the name should end in ``_total``."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts = entry[0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        entry[1] += value
+        entry[2] += 1
+
+    def time(self, **labels):
+        """Context manager that observes the seconds its block took (also in async code)."""
+        return _Timer(self, labels)
+
+    def count(self, **labels):
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def _samples(self, key, entry):
+        counts, total, count = entry
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, [("le", "+Inf")])
+        lines.append(f"{self.name}_bucket{labels} {count}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def render():
+    """Every registered metric in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+async def _handle_metrics(request):
+    return web.Response(text=render(), content_type="text/plain", charset="utf-8",
+                        headers={"X-Content-Type-Options": "nosniff"})
+
+
+async def start_server(port, host="127.0.0.1"):
+    """Serve ``/metrics`` on `host`:`port`; returns the runner, for ``runner.cleanup()``."""
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return runner
+
+
+async def monitor_event_loop(interval=LAG_INTERVAL):
+    """Record how much later than asked each `interval` sleep wakes: time the loop was busy elsewhere."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+class _RateLimitCounter(logging.Handler):
+    """Counts the 429 warnings discord.py logs before it sleeps and retries."""
+
+    def emit(self, record):
+        if record.levelno < logging.WARNING:
+            return
+        message = str(record.msg)
+        if "responded with 429" in message:
+            DISCORD_RATE_LIMITS.inc(scope="route")
+        elif "Global rate limit" in message:
+            DISCORD_RATE_LIMITS.inc(scope="global")
+
+
+FETCH_SECONDS = Histogram("lucebot_upstream_fetch_seconds", "Upstream fetch latency, retries included", ["source"])
+FETCH_ERRORS = Counter("lucebot_upstream_fetch_errors_total", "Upstream fetches that failed", ["source"])
+HANDLER_SECONDS = Histogram("lucebot_handler_seconds", "Time to handle a command or event, replies included",
+                            ["handler"])
+VERSE_PARSE_ATTEMPTS = Counter("lucebot_verse_parse_attempts_total", "Chat messages scanned for verse references")
+VERSE_PARSE_HITS = Counter("lucebot_verse_parse_hits_total", "Scanned messages that had a verse reference")
+SEARCH_SECONDS = Histogram("lucebot_search_seconds", "Time to rank an uncached Bible search in the worker pool")
+SEARCHES = Counter("lucebot_searches_total", "Bible searches by outcome", ["result"])
+SEND_SECONDS = Histogram("lucebot_send_seconds", "Duration of channel.send calls, including rate-limit retries",
+                         ["priority"])
+SEND_WAIT_SECONDS = Histogram("lucebot_send_wait_seconds", "Time a message waited in the send queue", ["priority"])
+SEND_ERRORS = Counter("lucebot_send_errors_total", "Channel sends that raised", ["priority"])
+DISCORD_RATE_LIMITS = Counter("lucebot_discord_rate_limits_total",
+                              "429s from Discord (each global one is also counted as a route 429)", ["scope"])
+EVENT_LOOP_LAG = Histogram("lucebot_event_loop_lag_seconds", "Event loop lag, sampled every 0.5s",
+                           buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5))
+
+logging.getLogger("discord.http").addHandler(_RateLimitCounter())
@@ -1,13 +1,176 @@
+"""Saint quotes, held in memory.
+
+All 1,866 quotes from the saint-quotes database are read once at startup.
+The daily quote is a pure function of the date, so the scheduled post and a
+later lookup agree.  ``!quote`` walks a shuffled rotation that goes through
+every quote before repeating one; its seed and position are saved so the
+rotation carries on across restarts.  The save happens in a thread a few
+seconds after the position changes (and on shutdown, with
+``flush_rotation``), so ``!quote`` itself never touches the disk.
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+import os
+import random
+import sqlite3
+import sys
+import threading
+from typing import NamedTuple
+
 import discord
 
-from saint_quotes import SaintQuotes
+log = logging.getLogger("lucebot")
+
+QUOTES_DB_PATH = "saint_quotes.db"
+ROTATION_PATH = os.getenv("QUOTE_ROTATION_PATH", "quote_rotation.json")
+# Fixed seed for the order of the daily quotes; changing it reshuffles every day's quote
+DAILY_SEED = 1866
+# Seconds after a !quote before the rotation position is written out
+SAVE_DELAY = 5
+
+
+class Quote(NamedTuple):
+    quote: str
+    author: str
+
+
+def _read_quotes(path):
+    """Read every (quote, author) pair from the saint-quotes SQLite database, in rowid order."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT quote, author FROM quotes ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+    # 224 authors across 1,866 quotes; intern so each name is stored once
+    return tuple(Quote(quote, sys.intern(author)) for quote, author in rows)
+
+
+QUOTES = _read_quotes(QUOTES_DB_PATH)
+_DAILY_ORDER = random.Random(DAILY_SEED).sample(range(len(QUOTES)), len(QUOTES))
+
+
+def get_daily_quote(date=None):
+    """Return the quote for `date` (default today).
+
+    Consecutive days step through a fixed shuffle of all quotes, so no quote
+    comes back until every other one has had its day.
+    """
+    date = date or datetime.date.today()
+    return QUOTES[_DAILY_ORDER[date.toordinal() % len(QUOTES)]]
+
+
+class _Rotation:
+    """Shuffled no-repeat order of quote indexes, with its position saved to ROTATION_PATH."""
+
+    def __init__(self, path, count):
+        self.path = path
+        self.count = count
+        self.seed, self.position = self._load()
+        self.order = self._shuffle(self.seed)
+        self._dirty = False
+        self._save_timer = None
+        self._write_lock = threading.Lock()
+        # Each saved state is numbered, so a slow background write can't overwrite a newer one
+        self._version = 0
+        self._written = 0
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            if state["count"] == self.count and 0 <= state["position"] <= self.count:
+                return state["seed"], state["position"]
+            log.info("Quote count changed; starting a new rotation")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError):
+            log.exception("Could not read quote rotation from %s; starting a new one", self.path)
+        return random.getrandbits(32), 0
+
+    def _shuffle(self, seed):
+        return random.Random(seed).sample(range(self.count), self.count)
+
+    def _write(self, version, state):
+        tmp = f"{self.path}.tmp"
+        with self._write_lock:
+            if version <= self._written:
+                return
+            self._written = version
+            try:
+                with open(tmp, "w") as f:
+                    json.dump(state, f)
+                os.replace(tmp, self.path)
+            except OSError:
+                log.exception("Could not save quote rotation to %s", self.path)
+
+    def _take_state(self):
+        """The state to save, or None if nothing changed since the last save."""
+        if not self._dirty:
+            return None
+        self._dirty = False
+        self._version += 1
+        return self._version, {"seed": self.seed, "position": self.position, "count": self.count}
+
+    def _schedule_save(self):
+        self._dirty = True
+        if self._save_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called outside the bot (a script or the REPL): just save now
+            self.flush()
+            return
+        self._save_timer = loop.call_later(SAVE_DELAY, self._save_in_background)
+
+    def _save_in_background(self):
+        self._save_timer = None
+        state = self._take_state()
+        if state is not None:
+            asyncio.get_running_loop().run_in_executor(None, self._write, *state)
+
+    def flush(self):
+        """Save now if the position changed since the last save."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+        state = self._take_state()
+        if state is not None:
+            self._write(*state)
+
+    def next(self):
+        if self.position >= self.count:
+            last = self.order[-1]
+            # Don't start the new cycle with the quote that ended the last one
+            while True:
+                self.seed, self.position = random.getrandbits(32), 0
+                self.order = self._shuffle(self.seed)
+                if self.count < 2 or self.order[0] != last:
+                    break
+        index = self.order[self.position]
+        self.position += 1
+        self._schedule_save()
+        return index
+
+
+_rotation = None
+
 
-sq = SaintQuotes("saint_quotes.db")
+def next_quote():
+    """Return the next quote of the ``!quote`` rotation."""
+    global _rotation
+    if _rotation is None:
+        _rotation = _Rotation(ROTATION_PATH, len(QUOTES))
+    return QUOTES[_rotation.next()]
 
 
-def get_daily_quote():
-    """Return a random saint quote."""
-    return sq.random()
+def flush_rotation():
+    """Write out the ``!quote`` rotation position if it has unsaved changes (on shutdown)."""
+    if _rotation is not None:
+        _rotation.flush()
 
 
 def format_quote_for_discord(quote):
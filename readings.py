@@ -1,18 +1,97 @@
+import datetime
+import logging
+
 import discord
-from catholic_mass_readings import USCCB
+
+import liturgy_store
+from cache import DailyCache
+from lectionary import local_mass
+from metrics import FETCH_ERRORS, FETCH_SECONDS
+
+try:
+    from catholic_mass_readings import USCCB, models
+except ImportError:  # optional: without it readings come from the local lectionary only
+    USCCB = models = None
+
+log = logging.getLogger("lucebot")
+
+# Where Novus Ordo readings come from: "local" (lectionary.py and the Knox Bible),
+# "usccb" (the scraped USCCB site), or "auto" (local when the lectionary has the day)
+SOURCES = ("auto", "local", "usccb")
+_source = "auto"
+
+
+def set_readings_source(source):
+    global _source
+    if source not in SOURCES:
+        raise ValueError(f"Unknown readings source {source!r}; expected one of {', '.join(SOURCES)}")
+    if source == "usccb" and USCCB is None:
+        raise ValueError("READINGS_SOURCE=usccb needs the catholic-mass-readings package")
+    _source = source
+
+
+async def fetch_mass(date):
+    """Scrape the mass readings for `date` from the USCCB website, or None if it isn't installed."""
+    if USCCB is None:
+        log.warning("catholic-mass-readings is not installed; no USCCB readings for %s", date)
+        return None
+    try:
+        with FETCH_SECONDS.time(source="usccb"):
+            async with USCCB() as usccb:
+                return await usccb.get_mass_from_date(date)
+    except Exception:
+        FETCH_ERRORS.inc(source="usccb")
+        raise
 
 
-async def get_daily_readings():
-    """Fetch today's mass readings from the USCCB website."""
-    async with USCCB() as usccb:
-        return await usccb.get_today_mass()
+def mass_from_dict(data):
+    """Rebuild a Mass from the dict produced by ``Mass.to_dict()``."""
+    sections = [
+        models.Section(
+            models.SectionType[section["type"]],
+            section["header"],
+            [
+                models.Reading([models.Verse(**verse) for verse in reading["verses"]], reading["text"])
+                for reading in section["readings"]
+            ],
+        )
+        for section in data["sections"]
+    ]
+    date = datetime.date.fromisoformat(data["date"]) if data.get("date") else None
+    return models.Mass(date, data.get("type_"), data["url"], data["title"], sections)
+
+
+async def _load_readings(date):
+    if _source != "usccb":
+        mass = local_mass(date)
+        if mass is not None or _source == "local":
+            return mass
+    data = liturgy_store.load("novus_ordo", date) if models is not None else None
+    if data is not None:
+        return mass_from_dict(data)
+    mass = await fetch_mass(date)
+    if mass is not None:
+        liturgy_store.save("novus_ordo", date, mass.to_dict())
+    return mass
+
+
+_readings_cache = DailyCache(_load_readings)
+
+
+async def get_daily_readings(date=None):
+    """Get the mass readings for `date` (default today).
+
+    Rendered locally from the lectionary when it has the day (see
+    ``set_readings_source``), else read from the store or the USCCB website.
+    """
+    return await _readings_cache.get(date)
 
 
 def format_for_discord(mass):
     """Format a Mass object into a list of Discord Embeds.
 
-    Returns a list of embeds: one title embed + one per section.
-    Discord allows up to 10 embeds per message.
+    Returns a list of embeds: one title embed + one per reading.  Long
+    readings are not truncated, so group them with ``embeds.pack_embeds``.
     """
     embeds = []
 
@@ -38,14 +117,10 @@ def format_for_discord(mass):
             else:
                 embed_title = f"{header} — {verse_ref}" if verse_ref else header
 
-            # The reading text; truncate if over embed description limit
-            text = reading.text.strip()
-            if len(text) > 4096:
-                text = text[:4093] + "..."
-
+            # The full reading text; pack_embeds splits it if it is too long
             embed = discord.Embed(
                 title=embed_title,
-                description=text,
+                description=reading.text.strip(),
                 color=discord.Color.blue(),
             )
 
@@ -1,9 +1,13 @@
 import datetime
 import logging
 
-import aiohttp
 import discord
 
+import http_client
+import liturgy_store
+from cache import DailyCache
+from metrics import FETCH_ERRORS, FETCH_SECONDS
+
 log = logging.getLogger("lucebot")
 
 API_BASE = "https://cpbjr.github.io/catholic-readings-api/liturgical-calendar"
@@ -12,26 +16,35 @@ API_BASE = "https://cpbjr.github.io/catholic-readings-api/liturgical-calendar"
 FEAST_TYPES = {"memorial", "feast", "solemnity", "optional memorial"}
 
 
-async def get_daily_saint() -> list[discord.Embed] | None | str:
+async def get_daily_saint(date: datetime.date | None = None) -> list[discord.Embed] | None | str:
     """Fetch the saint/celebration of the day from the liturgical calendar API.
 
     Returns a list of embeds for a saint feast, the string ``"no_feast"`` when
     the day is an ordinary weekday (FERIA), or ``None`` on fetch errors.
     """
-    today = datetime.date.today()
-    url = f"{API_BASE}/{today.year}/{today.strftime('%m-%d')}.json"
+    return await _saint_cache.get(date)
+
+
+async def fetch_saint_data(date: datetime.date) -> dict | None:
+    """Fetch the raw calendar entry for `date` from the API, or None on errors."""
+    url = f"{API_BASE}/{date.year}/{date.strftime('%m-%d')}.json"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    log.info("No saint data for %s (HTTP %s)", today, resp.status)
-                    return None
-                data = await resp.json()
+        with FETCH_SECONDS.time(source="saints"):
+            status, data = await http_client.get_json(url)
+        if status != 200:
+            log.info("No saint data for %s (HTTP %s)", date, status)
+            FETCH_ERRORS.inc(source="saints")
+            return None
     except Exception:
         log.exception("Failed to fetch saint data")
+        FETCH_ERRORS.inc(source="saints")
         return None
+    return data
+
 
+def format_saint(data: dict) -> list[discord.Embed] | str:
+    """Format a calendar entry as a list of embeds, or ``"no_feast"`` for an ordinary weekday."""
     celebration = data.get("celebration")
     if not celebration:
         return "no_feast"
@@ -59,3 +72,16 @@ async def get_daily_saint() -> list[discord.Embed] | None | str:
         embed.set_footer(text=quote)
 
     return [embed]
+
+
+async def _load_saint(date: datetime.date) -> list[discord.Embed] | None | str:
+    data = liturgy_store.load("saint", date)
+    if data is None:
+        data = await fetch_saint_data(date)
+        if data is None:
+            return None
+        liturgy_store.save("saint", date, data)
+    return format_saint(data)
+
+
+_saint_cache = DailyCache(_load_saint)
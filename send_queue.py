@@ -0,0 +1,229 @@
+"""Outbound message queue that paces channel sends under Discord's rate limits.
+
+Every ``channel.send`` goes through one priority queue drained by a few worker
+tasks.  Before sending, a worker takes a token from the channel's bucket and
+from a global bucket, so bulk fan-out stays under Discord's limits instead of
+running into 429 backoffs, and interactive replies (verse lookups, ``!``
+commands) are always dequeued ahead of scheduled broadcasts.  A channel out
+of tokens waits aside, without a worker, so it never delays other channels.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from metrics import SEND_ERRORS, SEND_SECONDS, SEND_WAIT_SECONDS
+
+log = logging.getLogger("lucebot")
+
+INTERACTIVE = 0
+BROADCAST = 1
+_PRIORITY_NAMES = {INTERACTIVE: "interactive", BROADCAST: "broadcast"}
+
+# Discord allows 50 requests/s globally and about 5 messages per 5s per channel;
+# stay a little under both
+GLOBAL_RATE = 40.0
+GLOBAL_BURST = 40
+CHANNEL_RATE = 1.0
+CHANNEL_BURST = 5
+WORKERS = 4
+_MAX_IDLE_BUCKETS = 10000
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second, up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_full(self):
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def try_acquire(self):
+        """Take a token if one is available, without waiting."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """Seconds until a token is available."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class SendQueue:
+    """Priority queue of channel sends with per-channel and global token buckets.
+
+    Each channel's sends wait in their own heap (interactive first, then in
+    order); the shared queue holds at most one entry per channel, for its
+    next send.  A channel whose bucket is empty is set aside until it has a
+    token again, so a burst to one channel never holds up the workers.
+    """
+
+    def __init__(self, *, workers=WORKERS, global_rate=GLOBAL_RATE, global_burst=GLOBAL_BURST,
+                 channel_rate=CHANNEL_RATE, channel_burst=CHANNEL_BURST):
+        self.workers = workers
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self._global = TokenBucket(global_rate, global_burst)
+        self._channels = {}
+        # {channel_id: heap of (priority, seq, queued_at, channel, args, kwargs, future)}
+        self._pending = {}
+        # Channels a worker is sending to, or that are waiting for a token
+        self._busy = set()
+        self._timers = {}
+        self._queue = None
+        self._tasks = []
+        self._seq = itertools.count()
+        self._stats = {p: {"queued": 0, "sent": 0, "failed": 0, "wait_total": 0.0, "wait_max": 0.0}
+                       for p in _PRIORITY_NAMES}
+
+    def start(self):
+        """Start the worker tasks (inside the running event loop)."""
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        # Channels that got sends before a restart
+        for channel_id in self._pending:
+            self._schedule(channel_id)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._busy.clear()
+
+    async def send(self, channel, *args, priority=BROADCAST, **kwargs):
+        """Queue ``channel.send(*args, **kwargs)`` and return its result once sent."""
+        if not self._tasks:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._stats[priority]["queued"] += 1
+        heap = self._pending.setdefault(channel.id, [])
+        heapq.heappush(heap, (priority, next(self._seq), time.monotonic(), channel, args, kwargs, future))
+        if heap[0][-1] is future:
+            # A new head (e.g. a reply ahead of queued broadcasts) gets its own, earlier entry
+            self._schedule(channel.id)
+        return await future
+
+    def _schedule(self, channel_id):
+        """Put the channel's next send on the shared queue, unless it is busy or has none."""
+        heap = self._pending.get(channel_id)
+        if channel_id in self._busy or not heap:
+            return
+        priority, seq = heap[0][:2]
+        self._queue.put_nowait((priority, seq, channel_id))
+
+    def _release(self, channel_id):
+        self._busy.discard(channel_id)
+        self._timers.pop(channel_id, None)
+        if self._pending.get(channel_id):
+            self._schedule(channel_id)
+        else:
+            self._pending.pop(channel_id, None)
+
+    def _channel_bucket(self, channel_id):
+        bucket = self._channels.get(channel_id)
+        if bucket is None:
+            if len(self._channels) >= _MAX_IDLE_BUCKETS:
+                # A full bucket is the same as a fresh one, so those can go
+                for key in [k for k, b in self._channels.items() if b.is_full()]:
+                    del self._channels[key]
+            bucket = self._channels[channel_id] = TokenBucket(self.channel_rate, self.channel_burst)
+        return bucket
+
+    def _next_item(self, channel_id):
+        """Pop the channel's next send that is still wanted, or None."""
+        heap = self._pending.get(channel_id, [])
+        while heap:
+            item = heapq.heappop(heap)
+            self._stats[item[0]]["queued"] -= 1
+            if not item[-1].cancelled():
+                return item
+        return None
+
+    async def _worker(self):
+        while True:
+            _priority, _seq, channel_id = await self._queue.get()
+            try:
+                # Entries go stale when a better head was queued for the same channel
+                if channel_id in self._busy or not self._pending.get(channel_id):
+                    continue
+                self._busy.add(channel_id)
+                bucket = self._channel_bucket(channel_id)
+                if not bucket.try_acquire():
+                    loop = asyncio.get_running_loop()
+                    self._timers[channel_id] = loop.call_later(bucket.wait_time(), self._release, channel_id)
+                    continue
+                try:
+                    item = self._next_item(channel_id)
+                    if item is not None:
+                        await self._send(item)
+                finally:
+                    self._release(channel_id)
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, item):
+        priority, _seq, queued_at, channel, args, kwargs, future = item
+        stats = self._stats[priority]
+        await self._global.acquire()
+        wait = time.monotonic() - queued_at
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+        name = _PRIORITY_NAMES[priority]
+        SEND_WAIT_SECONDS.observe(wait, priority=name)
+        try:
+            with SEND_SECONDS.time(priority=name):
+                result = await channel.send(*args, **kwargs)
+        except Exception as e:
+            stats["failed"] += 1
+            SEND_ERRORS.inc(priority=name)
+            if not future.done():
+                future.set_exception(e)
+        else:
+            stats["sent"] += 1
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self):
+        """Queue depth, sent/failed counts and wait times (seconds) per priority."""
+        result = {}
+        for priority, name in _PRIORITY_NAMES.items():
+            s = self._stats[priority]
+            done = s["sent"] + s["failed"]
+            result[name] = {
+                "queued": s["queued"],
+                "sent": s["sent"],
+                "failed": s["failed"],
+                "wait_avg": s["wait_total"] / done if done else 0.0,
+                "wait_max": s["wait_max"],
+            }
+        return result
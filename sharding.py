@@ -0,0 +1,39 @@
+"""Shard arithmetic shared by the bot and the shard supervisor.
+
+Discord assigns each guild to shard ``(guild_id >> 22) % shard_count``.  The
+supervisor splits the shards into contiguous ranges, one per worker process,
+and passes each worker its range in SHARD_IDS; a worker posts only to the
+guilds on its own shards, so every channel gets each daily post once.
+"""
+
+
+def shard_for_guild(guild_id, shard_count):
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(spec):
+    """Parse ``"0-3"`` or ``"0,2,5-7"`` into a sorted list of shard ids; None when empty."""
+    ids = set()
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        first, _, last = item.partition("-")
+        try:
+            ids.update(range(int(first), int(last or first) + 1))
+        except ValueError:
+            raise ValueError(f"Bad shard range {item!r}; expected e.g. 0-3 or 0,2,5") from None
+    return sorted(ids) or None
+
+
+def split_shards(shard_count, workers):
+    """Split shards 0..shard_count-1 into at most `workers` contiguous, near-equal ranges."""
+    workers = max(1, min(workers, shard_count))
+    size, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for i in range(workers):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(range(start, end))
+        start = end
+    return ranges
+
+
+def format_shard_ids(shards):
+    return f"{shards[0]}-{shards[-1]}" if len(shards) > 1 else str(shards[0])
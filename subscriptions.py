@@ -0,0 +1,115 @@
+"""Per-channel subscriptions to the daily posts, persisted in SQLite.
+
+Each subscribed channel picks its readings type, which daily items it gets
+and the local hour they are posted.  All subscriptions are held in memory
+(a few hundred bytes each), so the scheduler never queries the database.
+"""
+
+import os
+import sqlite3
+from typing import NamedTuple
+from zoneinfo import ZoneInfo
+
+STORE_PATH = os.getenv("SUBSCRIPTIONS_DB_PATH", "subscriptions.db")
+
+ITEMS = ("readings", "quote", "saint")
+READINGS_TYPES = ("novus_ordo", "latin")
+DEFAULT_TIMEZONE = "America/New_York"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    channel_id INTEGER PRIMARY KEY,
+    guild_id INTEGER,
+    readings_type TEXT NOT NULL,
+    items TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    timezone TEXT NOT NULL
+)
+"""
+
+
+class Subscription(NamedTuple):
+    channel_id: int
+    guild_id: int | None
+    readings_type: str = "novus_ordo"
+    items: tuple[str, ...] = ("readings",)
+    hour: int = 7
+    timezone: str = DEFAULT_TIMEZONE
+
+    @property
+    def tzinfo(self):
+        return ZoneInfo(self.timezone)
+
+
+_conn = None
+_subscriptions = None  # {channel_id: Subscription}
+
+
+def _connection():
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(STORE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(STORE_PATH)
+        _conn.execute(_SCHEMA)
+        _conn.commit()
+    return _conn
+
+
+def _loaded():
+    global _subscriptions
+    if _subscriptions is None:
+        rows = _connection().execute(
+            "SELECT channel_id, guild_id, readings_type, items, hour, timezone FROM subscriptions"
+        )
+        _subscriptions = {
+            row[0]: Subscription(row[0], row[1], row[2], tuple(row[3].split(",")), row[4], row[5])
+            for row in rows
+        }
+    return _subscriptions
+
+
+def validate(sub):
+    """Raise ValueError if a subscription has an unknown type, item, hour or timezone."""
+    if sub.readings_type not in READINGS_TYPES:
+        raise ValueError(f"Unknown readings type {sub.readings_type!r}")
+    if not sub.items or any(item not in ITEMS for item in sub.items):
+        raise ValueError(f"Items must be some of {', '.join(ITEMS)}")
+    if not 0 <= sub.hour <= 23:
+        raise ValueError("Hour must be between 0 and 23")
+    try:
+        ZoneInfo(sub.timezone)
+    except (ValueError, KeyError):
+        raise ValueError(f"Unknown timezone {sub.timezone!r}") from None
+
+
+def all_subscriptions():
+    """Return {channel_id: Subscription} for every stored subscription."""
+    return dict(_loaded())
+
+
+def for_guild(guild_id):
+    return [sub for sub in _loaded().values() if sub.guild_id == guild_id]
+
+
+def save(sub):
+    """Validate and store (or replace) the subscription for its channel."""
+    validate(sub)
+    conn = _connection()
+    conn.execute(
+        "INSERT OR REPLACE INTO subscriptions (channel_id, guild_id, readings_type, items, hour, timezone) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        (sub.channel_id, sub.guild_id, sub.readings_type, ",".join(sub.items), sub.hour, sub.timezone),
+    )
+    conn.commit()
+    _loaded()[sub.channel_id] = sub
+
+
+def remove(channel_id):
+    """Delete a channel's subscription; returns True if there was one."""
+    conn = _connection()
+    deleted = conn.execute("DELETE FROM subscriptions WHERE channel_id = ?", (channel_id,)).rowcount
+    conn.commit()
+    _loaded().pop(channel_id, None)
+    return bool(deleted)
@@ -0,0 +1,185 @@
+"""Run the bot as several worker processes, each owning a range of shards.
+
+One process shares a single core between every guild's gateway traffic,
+verse scanning and searches.  The supervisor splits the shards into
+contiguous ranges and starts ``bot.py`` once per range (SHARD_COUNT and
+SHARD_IDS in its environment), so the load spreads over the cores:
+
+    python supervisor.py
+
+Settings (besides the bot's own):
+
+    SHARD_COUNT=8      # total shards; default: Discord's recommendation for the bot
+    SHARD_WORKERS=4    # worker processes; default: one per CPU
+    METRICS_PORT=9100  # worker N serves its metrics on METRICS_PORT + N
+
+Each worker posts the daily items only for guilds on its own shards, and
+only the worker with shard 0 syncs the slash commands.  The Knox Bible is
+compiled once up front; every worker memory-maps the same read-only file, so
+the OS keeps a single copy of it in memory.  Workers are started in turn to
+respect Discord's identify rate limit, and restarted with backoff if they
+exit.
+"""
+
+import json
+import logging
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from dotenv import load_dotenv
+
+from bible_store import CompiledBible, compile_bible
+from sharding import format_shard_ids, split_shards
+
+log = logging.getLogger("lucebot")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BOT_PATH = os.path.join(HERE, "bot.py")
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+# Discord allows one identify per 5 seconds in each of max_concurrency buckets
+IDENTIFY_INTERVAL = 5
+MAX_BACKOFF = 60
+# A worker that stayed up this long had a good run; its next restart starts the backoff over
+STABLE_AFTER = 60
+
+
+def recommended_shards(token):
+    """Ask Discord for the bot's recommended shard count and identify concurrency."""
+    request = urllib.request.Request(GATEWAY_URL, headers={
+        "Authorization": f"Bot {token}",
+        "User-Agent": "lucebot supervisor",
+    })
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = json.load(response)
+    return data["shards"], data.get("session_start_limit", {}).get("max_concurrency", 1)
+
+
+def ensure_compiled_bible():
+    """Compile knox.bin if it is missing or stale, so every worker maps the same file."""
+    source = os.path.join(HERE, "knox.json")
+    compiled = os.path.join(HERE, "knox.bin")
+    if os.path.exists(compiled):
+        try:
+            store = CompiledBible(compiled)
+        except (OSError, ValueError):
+            pass
+        else:
+            fresh = store.is_fresh(source)
+            store.close()
+            if fresh:
+                return
+    log.info("Compiling %s for the workers", source)
+    compile_bible(source, compiled)
+
+
+class Worker:
+    def __init__(self, index, shards, shard_count):
+        self.index = index
+        self.shards = shards
+        self.shard_count = shard_count
+        self.process = None
+        self.started_at = 0.0
+        self.backoff = 1
+        self.restart_at = None
+
+    @property
+    def name(self):
+        return f"shards {format_shard_ids(self.shards)}"
+
+    def start(self):
+        shard_ids = format_shard_ids(self.shards)
+        # Each worker keeps its own !quote rotation rather than overwriting a shared one
+        root, ext = os.path.splitext(os.getenv("QUOTE_ROTATION_PATH", "quote_rotation.json"))
+        env = dict(os.environ, SHARD_COUNT=str(self.shard_count), SHARD_IDS=shard_ids,
+                   QUOTE_ROTATION_PATH=f"{root}.{shard_ids}{ext}")
+        # Workers can't share a metrics port, so each takes the next one up
+        if os.getenv("METRICS_PORT"):
+            env["METRICS_PORT"] = str(int(os.environ["METRICS_PORT"]) + self.index)
+        self.process = subprocess.Popen([sys.executable, BOT_PATH], env=env, cwd=os.getcwd())
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        log.info("Started worker for %s (pid %d)", self.name, self.process.pid)
+
+    def check(self, now):
+        """Restart the worker if it has exited and its backoff has passed."""
+        if self.restart_at is None:
+            code = self.process.poll()
+            if code is None:
+                return
+            if now - self.started_at >= STABLE_AFTER:
+                self.backoff = 1
+            log.warning("Worker for %s exited with %s; restarting in %ds", self.name, code, self.backoff)
+            self.restart_at = now + self.backoff
+            self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+        elif now >= self.restart_at:
+            self.start()
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+    def wait(self, timeout):
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            log.warning("Worker for %s did not stop; killing it", self.name)
+            self.process.kill()
+            self.process.wait()
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        raise RuntimeError("DISCORD_TOKEN not set in .env")
+    shard_count = int(os.getenv("SHARD_COUNT") or 0)
+    max_concurrency = 1
+    if not shard_count:
+        shard_count, max_concurrency = recommended_shards(token)
+        log.info("Discord recommends %d shards (identify concurrency %d)", shard_count, max_concurrency)
+    workers = int(os.getenv("SHARD_WORKERS") or os.cpu_count() or 1)
+
+    ensure_compiled_bible()
+    pool = [Worker(i, shards, shard_count) for i, shards in enumerate(split_shards(shard_count, workers))]
+    log.info("Running %d shards in %d workers", shard_count, len(pool))
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        for worker in pool:
+            if stopping:
+                break
+            worker.start()
+            # Let this worker's shards identify before the next worker starts its own
+            deadline = time.monotonic() + IDENTIFY_INTERVAL * len(worker.shards) / max_concurrency
+            while not stopping and time.monotonic() < deadline:
+                time.sleep(0.5)
+        while not stopping:
+            now = time.monotonic()
+            for worker in pool:
+                worker.check(now)
+            time.sleep(1)
+    finally:
+        log.info("Stopping %d workers", len(pool))
+        for worker in pool:
+            worker.stop()
+        for worker in pool:
+            worker.wait(timeout=15)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Runs CPU-bound work (Bible search, index builds) off the event loop.
+
+A long search on the event loop stalls discord.py's gateway heartbeats and
+every other guild's messages.  ``WorkerPool`` hands such calls to a thread or
+process pool and bounds them: at most `workers` run at once, at most
+`max_pending` more may wait, and each caller gives up after `timeout` seconds.
+Threads share the loaded Bible and search index but still take turns on the
+GIL; processes build their own copies and run truly in parallel.  Processes
+are started fresh (forkserver, or spawn where that is missing) rather than
+forked from the running bot, which would copy its event loop, gateway
+sockets, HTTP session and threads into every child.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+KINDS = ("thread", "process")
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class PoolBusy(Exception):
+    """Raised when a WorkerPool already has its maximum number of calls waiting."""
+
+
+class WorkerPool:
+    """Bounded thread or process pool for blocking calls from coroutines."""
+
+    def __init__(self, kind="thread", workers=2, *, max_pending=16, timeout=10.0, initializer=None):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown worker pool kind {kind!r}; expected one of {', '.join(KINDS)}")
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.initializer = initializer
+        self._executor = None
+        self._slots = asyncio.Semaphore(workers)
+        self._pending = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context(START_METHOD), initializer=self.initializer,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="lucebot-worker")
+                if self.initializer is not None:
+                    self._executor.submit(self.initializer)
+        return self._executor
+
+    def start(self):
+        """Create the executor now (running the initializer) instead of on the first call."""
+        self._get_executor()
+
+    async def run(self, func, *args):
+        """Run ``func(*args)`` in the pool and return its result.
+
+        Raises PoolBusy when too many calls are already waiting, and
+        asyncio.TimeoutError when the call (including its wait for a worker)
+        takes longer than the timeout.  A timed-out call cannot be interrupted;
+        it finishes in the background while holding its worker.
+        """
+        if self._pending >= self.workers + self.max_pending:
+            self.rejected += 1
+            raise PoolBusy()
+        self._pending += 1
+        try:
+            return await asyncio.wait_for(self._run(func, args), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self._pending -= 1
+
+    async def _run(self, func, args):
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        # Hold the worker slot until the call really ends, even if the caller
+        # times out, so abandoned calls can't pile more work onto the pool
+        future.add_done_callback(self._release)
+        result = await asyncio.shield(future)
+        self.completed += 1
+        return result
+
+    def _release(self, future):
+        self._slots.release()
+        if not future.cancelled():
+            # Mark any error retrieved; a caller still waiting gets it through the shield
+            future.exception()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self):
+        return {"kind": self.kind, "workers": self.workers, "pending": self._pending,
+                "completed": self.completed, "timeouts": self.timeouts, "rejected": self.rejected}